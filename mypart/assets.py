@@ -1,35 +1,115 @@
+import math
+import os
 import pygame
+from collections import OrderedDict
 from settings import *
+from atlas import ATLAS_FILE
+from registry import AssetRegistry, surface_bytes
+from fonts import FontManager
 
 pygame.font.init()
+# Chemin du TTF résolu une fois puis gardé dans font_cache.json (voir fonts.py)
+font_manager = FontManager()
 
 def get_font(size):
-    return pygame.font.SysFont(["impact", "arialblack", "arial"], size)
+    return font_manager.get(size)
 # --- Polices ---
 font_letter = get_font(35)
 font_small = get_font(22)
 font_huge = get_font(50)
 
+LETTER_SHADOW = (20, 20, 20)
+
+
+class TextCache:
+    """ Textes déjà rendus (LRU borné), pour ne pas rasteriser la police à chaque frame """
+    def __init__(self, max_size=TEXT_CACHE_MAX):
+        self.max_size = max_size
+        self.cache = OrderedDict()
+        self.hits = self.misses = 0
+
+    def render(self, font, text, antialias, color):
+        """Même signature que font.render, mais le résultat est mis en cache"""
+        key = (font, text, antialias, tuple(color))
+        surf = self.cache.get(key)
+        if surf is not None:
+            self.hits += 1
+            self.cache.move_to_end(key)
+            return surf
+        self.misses += 1
+        surf = font.render(text, antialias, color)
+        self.cache[key] = surf
+        if len(self.cache) > self.max_size:
+            self.cache.popitem(last=False)
+        return surf
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self.cache),
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+text_cache = TextCache()
+
+
+def render_text(font, text, antialias, color):
+    """Rendu de texte via le cache LRU (à utiliser à la place de font.render)"""
+    return text_cache.render(font, text, antialias, color)
+
+
+# --- Atlas des lettres affichées sur les objets (ombre + couleurs des labels) ---
+letter_atlas = {}
+for _letter in "awsdjkl":
+    for _color in (RED, GREEN, LETTER_SHADOW):
+        letter_atlas[(_letter, _color)] = font_letter.render(_letter.upper(), True, _color)
+
+
+def get_letter(letter, color):
+    """Retourne la lettre pré-rendue (ou passe par le cache si elle n'est pas dans l'atlas)"""
+    surf = letter_atlas.get((letter, color))
+    if surf is None:
+        surf = text_cache.render(font_letter, letter.upper(), True, color)
+    return surf
+
+# --- Sons (fichiers cherchés dans ASSET_DIRS["sound"], voir registry) ---
+SOUND_FILES = {
+    "ice": "ice.wav",
+    "lightning": "lightning.wav",
+    "slash": "slash.wav",
+    "bomb": "bomb.wav",
+    "halo": "halo.wav",
+    "fruit_cut": "fruit.wav",
+}
+
+# SFX/ambiance additionnels (compatibles avec gameplay.py), facultatifs
+EXTRA_SOUND_FILES = {
+    "start": "main_start.mp3",
+    "strike": "strike.mp3",
+    "explode": "Explode.mp3",
+    "projection_fruits": "projection_fruits.mp3",
+    "projection_icecube": "projection_iceblock.mp3",
+    "projection_spinner": "projection_spinner.mp3",
+    "projection_bomb": "projection_bomb.wav",
+    "slash_combo": "slash_combo.mp3",
+    "spiner_bonus": "spiner_bonus.mp3",
+    "light_bonus": "lightning.wav",
+    "ice_bonus": "ice_bonus.mp3",
+    "slash_impact": "slash_impact.mp3",
+}
+
+
+def load_sound(name):
+    """Son `name` depuis le registre ; None si le fichier manque (le jeu tourne sans ce son)"""
+    return registry.acquire(f"sound:{name}")
+
+
 def load_sounds():
     pygame.mixer.init()
-    sounds = {}
-    sound_files = {
-        "ice": "sound/ice.wav",
-        "lightning": "sound/lightning.wav",
-        "slash": "sound/slash.wav",
-        "bomb": "sound/bomb.wav",
-        "halo": "sound/halo.wav",
-        "fruit_cut": "sound/fruit.wav",
-    }
-    
-    for name, file in sound_files.items():
-        try:
-            sounds[name] = pygame.mixer.Sound(file)
-        except:
-            # Si le fichier manque, on crée un objet vide pour éviter que le jeu plante
-            sounds[name] = None 
-            print(f"Attention : Son {file} non trouvé")
-    return sounds
+    return {name: load_sound(name) for name in SOUND_FILES}
 
 def play_music(state):
     """Gère le changement de musique selon l'état du jeu"""
@@ -46,44 +126,301 @@ def play_music(state):
 
 
 
-# --- Liste des images (Clés en anglais) ---
-def load_game_assets():
-    IMAGES_LIST = {
-        "apricot": "image/abricot.png",
-        "pineapple": "image/ananas.png",
-        "banana": "image/banane.png",
-        "bomb": "image/bombe.png",
-        "cherry": "image/cerise.png",
-        "lemon": "image/citron.png",
-        "strawberry": "image/fraise.png",
-        "raspberry": "image/framboise.png",
-        "dragon_fruit": "iamge/fruit_du_dragon.png",
-        "ice_block": "image/glaçon.png",
-        "kiwi": "image/kiwi.png",
-        "mango": "image/mangue.png",
-        "melon": "image/melon.png",
-        "blueberry": "image/myrtille.png",
-        "coconut": "image/noix_de_coco.png",
-        "orange": "image/orange.png",
-        "watermelon": "image/pasteque.png",
-        "peach": "image/peche.png",
-        "pear": "image/poire.png",
-        "apple": "image/pomme.png",
-        "grape": "image/raisin.png",
-        "shuriken": "image/shuriken.png",
-        "lightning": "image/eclair.png",
+def rotated_size(w, h, angle):
+    """Taille de pygame.transform.rotate sur une image w x h, sans la pivoter"""
+    if angle % 90 == 0:
+        return (w, h) if angle % 180 == 0 else (h, w)
+    c, s = abs(math.cos(math.radians(angle))), abs(math.sin(math.radians(angle)))
+    return int(w * c + h * s), int(w * s + h * c)
+
+
+class RotationCache:
+    """ Sprites pivotés pré-calculés, indexés par (type de sprite, image source, angle quantifié)
+
+    L'image fait partie de la clé : un objet lancé avec un placeholder (sprites
+    encore en chargement) ne peut pas remplir le cache à la place du vrai sprite.
+    La taille est bornée en octets (largeur x hauteur x 4 par sprite pivoté).
+    """
+    def __init__(self, step=ROTATION_STEP, max_bytes=ROTATION_CACHE_BYTES):
+        self.step = step
+        self.max_bytes = max_bytes  # None : taille déduite des sprites (voir fit)
+        self.sizes = None  # Tailles des sprites et de leurs moitiés données à fit()
+        self.capacity = None  # Octets max en vigueur (None : pas de limite)
+        self.bytes = 0
+        self.cache = OrderedDict()  # Ordre LRU : le plus ancien en premier
+        self.hits = self.misses = 0
+
+    def configure(self, step=None, max_bytes=None):
+        """Change le pas d'angle et/ou la taille max en octets (vide le cache si le pas change)"""
+        if step is not None and step != self.step:
+            self.step = step
+            self.clear()
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+        self._resize()
+
+    def fit(self, image_data):
+        """Dimensionne le cache pour ces sprites : chacun et ses deux moitiés, à tous les angles"""
+        self.sizes = []
+        for image in image_data.values():
+            w, h = image.get_size()
+            self.sizes += [(w, h), (w // 2, h), (w // 2, h)]
+        self._resize()
+
+    def working_bytes(self):
+        """Octets de toutes les rotations des sprites donnés à fit()"""
+        total = 0
+        for w, h in self.sizes or ():
+            for angle in range(0, 360, self.step):
+                rw, rh = rotated_size(w, h, angle)
+                total += rw * rh * 4
+        return total
+
+    def _resize(self):
+        if self.max_bytes is not None:
+            self.capacity = self.max_bytes
+        elif self.sizes is not None:
+            self.capacity = self.working_bytes()
+        self._trim()
+
+    def _trim(self):
+        while self.capacity is not None and self.bytes > self.capacity:
+            _, rotated = self.cache.popitem(last=False)
+            self.bytes -= surface_bytes(rotated)
+
+    def clear(self):
+        self.cache.clear()
+        self.bytes = 0
+
+    def quantize(self, angle):
+        return int(round(angle / self.step) * self.step) % 360
+
+    def get(self, key, image, angle):
+        """Retourne le sprite pivoté (calculé une seule fois par angle quantifié)"""
+        quantized = self.quantize(angle)
+        cache_key = (key, image, quantized)
+        rotated = self.cache.get(cache_key)
+        if rotated is not None:
+            self.hits += 1
+            self.cache.move_to_end(cache_key)
+            return rotated
+        self.misses += 1
+        rotated = pygame.transform.rotate(image, quantized)
+        self.cache[cache_key] = rotated
+        self.bytes += surface_bytes(rotated)
+        self._trim()
+        return rotated
+
+    def warm(self, image_data):
+        """Pré-remplit le cache pour tous les sprites (dans la limite de capacity)"""
+        for name, image in image_data.items():
+            for angle in range(0, 360, self.step):
+                if self.capacity is not None and self.bytes >= self.capacity:
+                    return
+                self.get(name, image, angle)
+
+    def stats(self):
+        return {
+            "size": len(self.cache),
+            "bytes": self.bytes,
+            "max_bytes": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+rotation_cache = RotationCache()
+
+class LayerCache:
+    """ Calques pré-calculés (teintes plein écran, halos), construits une fois par taille et couleur """
+    def __init__(self):
+        self.layers = {}
+        self.requested_bytes = 0  # Surfaces par frame qu'allouaient les teintes sans cache
+        self.allocated_bytes = 0  # Ce qui a réellement été alloué
+        self.halo_draws = 0  # Halos blittés (avant : draw.circle sur l'écran, sans allocation)
+        self.frames = 0
+
+    def _get(self, key, size, build):
+        surf = self.layers.get(key)
+        w, h = size
+        if surf is None:
+            surf = pygame.Surface(size, pygame.SRCALPHA)
+            build(surf)
+            self.layers[key] = surf
+            self.allocated_bytes += w * h * 4
+        return surf
+
+    def tint(self, size, rgba):
+        """Calque uni semi-transparent (surcharge, glaçon, assombrissement des menus)"""
+        w, h = size
+        self.requested_bytes += w * h * 4
+        return self._get(("tint", tuple(size), tuple(rgba)), size, lambda s: s.fill(rgba))
+
+    def halo(self, radius, width, color):
+        """Cercle (halo doré des objets enrobés), centré dans sa surface"""
+        size = (radius * 2 + 2, radius * 2 + 2)
+        self.halo_draws += 1
+        return self._get(
+            ("halo", radius, width, tuple(color)),
+            size,
+            lambda s: pygame.draw.circle(s, color, (radius + 1, radius + 1), radius, width),
+        )
+
+    def end_frame(self):
+        self.frames += 1
+
+    def stats(self):
+        frames = max(1, self.frames)
+        return {
+            "layers": len(self.layers),
+            "bytes_per_frame_before": self.requested_bytes / frames,
+            "bytes_per_frame_after": self.allocated_bytes / frames,
+            "halos_per_frame": self.halo_draws / frames,
+        }
+
+
+layer_cache = LayerCache()
+
+# --- Moitiés de sprites pour les fruits coupés (partagées par tous les FruitSlice) ---
+half_sprites = {}
+
+
+def get_half(key, image, side):
+    """Retourne la moitié gauche/droite du sprite, découpée une seule fois par type"""
+    half = half_sprites.get((key, image, side))  # Image dans la clé : voir RotationCache
+    if half is None:
+        w, h = image.get_size()
+        half = pygame.Surface((w // 2, h), pygame.SRCALPHA)
+        half.blit(image, (0, 0), (0 if side == "left" else w // 2, 0, w // 2, h))
+        half_sprites[(key, image, side)] = half
+    return half
+
+
+def split_halves(image_data):
+    """Pré-découpe les moitiés de tous les sprites (appelé au chargement)"""
+    for name, image in image_data.items():
+        get_half(name, image, "left")
+        get_half(name, image, "right")
+
+
+# --- Liste des images (Clés en anglais), cherchées dans ASSET_DIRS["image"] ---
+SPRITE_FILES = {
+    "apricot": "abricot.png",
+    "pineapple": "ananas.png",
+    "banana": "banane.png",
+    "bomb": "bombe.png",
+    "cherry": "cerise.png",
+    "lemon": "citron.png",
+    "strawberry": "fraise.png",
+    "raspberry": "framboise.png",
+    "dragon_fruit": "fruit_du_dragon.png",
+    "ice_block": "glaçon.png",
+    "kiwi": "kiwi.png",
+    "mango": "mangue.png",
+    "melon": "melon.png",
+    "blueberry": "myrtille.png",
+    "coconut": "noix_de_coco.png",
+    "orange": "orange.png",
+    "watermelon": "pasteque.png",
+    "peach": "peche.png",
+    "pear": "poire.png",
+    "apple": "pomme.png",
+    "grape": "raisin.png",
+    "shuriken": "shuriken.png",
+    "lightning": "eclair.png",
+}
+
+# --- Manifeste : tous les assets du jeu, par nom ---
+ASSET_DIRS = {
+    "image": ["image", "images"],
+    "atlas": [os.path.dirname(ATLAS_FILE)],
+    "sound": ["sound", "Sounds"],
+    "music": ["sound", "Sounds"],
+}
+MANIFEST = {
+    "atlas:sprites": {"type": "atlas", "file": os.path.basename(ATLAS_FILE), "optional": True},
+    "ui:menu": {"type": "image", "file": "menu.png", "size": (WIDTH, HEIGHT), "alpha": False,
+                "smooth": True, "optional": True},
+    "ui:game": {"type": "image", "file": "fondgame.png", "size": (WIDTH, HEIGHT), "smooth": True,
+                "optional": True},
+    # Titre : redimensionné UNE fois à 400 px de large (évite de le re-scaler à chaque frame)
+    "ui:title": {"type": "image", "file": "title.png", "width": 400, "smooth": True, "optional": True},
+    # Ambiances : lues en streaming (voir music.py), jamais décodées en entier
+    "music:menu": {"type": "music", "file": "ambiance.mp3", "optional": True},
+    "music:play": {"type": "music", "file": "ambiance_game.mp3", "optional": True},
+}
+MANIFEST.update({f"sprite:{name}": {"type": "image", "file": file, "size": (60, 60)}
+                 for name, file in SPRITE_FILES.items()})
+MANIFEST.update({f"sound:{name}": {"type": "sound", "file": file}
+                 for name, file in SOUND_FILES.items()})
+MANIFEST.update({f"sound:{name}": {"type": "sound", "file": file, "optional": True}
+                 for name, file in EXTRA_SOUND_FILES.items()})
+
+registry = AssetRegistry(MANIFEST, ASSET_DIRS)
+
+
+def placeholder_sprite(name):
+    """Rond de couleur affiché à la place d'une image manquante (ou pas encore chargée)"""
+    surf = pygame.Surface((60, 60), pygame.SRCALPHA)
+    color = ICE_BLUE if name == "ice_block" else (ELECTRIC_ORANGE if name == "lightning" else GREEN)
+    pygame.draw.circle(surf, color, (30, 30), 25)
+    return surf
+
+
+def placeholder_sprites():
+    return {name: placeholder_sprite(name) for name in SPRITE_FILES}
+
+
+def load_sprite_files():
+    """Décode les PNG de SPRITE_FILES (60x60), avec un rond de couleur si une image manque"""
+    return {
+        name: registry.acquire(f"sprite:{name}") or placeholder_sprite(name)
+        for name in SPRITE_FILES
     }
 
-    image_data = {}
-    for name, filename in IMAGES_LIST.items():
-        try:
-            img = pygame.image.load(filename).convert_alpha()
-            image_data[name] = pygame.transform.scale(img, (60, 60))
-        except:
-            # Fallback visuel si l'image est manquante
-            surf = pygame.Surface((60, 60), pygame.SRCALPHA)
-            color = ICE_BLUE if name == "ice_block" else (ELECTRIC_ORANGE if name == "lightning" else GREEN)
-            pygame.draw.circle(surf, color, (30, 30), 25)
-            image_data[name] = surf 
-    
-    return image_data
\ No newline at end of file
+
+def sprite_sources():
+    """Chemin de l'image de chaque sprite (None si absente), pour vérifier l'atlas"""
+    return {name: registry.resolve(f"sprite:{name}") for name in SPRITE_FILES}
+
+
+def load_sprites(use_atlas=True):
+    """Sprites du jeu : depuis l'atlas s'il existe (voir atlas.py), sinon depuis les PNG
+
+    Ne touche à aucun cache de rendu : peut tourner dans un thread de chargement.
+    """
+    if use_atlas:
+        # Le registre garde le fichier projeté ouvert tant que les sprites sont utilisés
+        atlas = registry.acquire("atlas:sprites")
+        if atlas is not None:
+            stale = atlas.stale(sprite_sources())
+            if not stale:
+                return atlas.sprites()
+            print(f"Atlas périmé ({', '.join(stale)}), chargement des PNG (relancer python atlas.py)")
+        registry.release("atlas:sprites")
+    return load_sprite_files()
+
+
+def install_sprites(image_data, sprites):
+    """Remplace les sprites de image_data (ex : placeholders) et refait les caches qui en dépendent
+
+    Les objets déjà à l'écran gardent leur placeholder jusqu'à leur sortie : les
+    caches étant indexés par image, ils ne se mélangent pas aux vrais sprites.
+    """
+    image_data.update(sprites)
+    half_sprites.clear()
+    rotation_cache.clear()
+    rotation_cache.fit(image_data)
+    split_halves(image_data)
+
+
+def load_game_assets(prerotate=False, use_atlas=True):
+    image_data = load_sprites(use_atlas)
+    rotation_cache.fit(image_data)
+    split_halves(image_data)
+    # Option : calcule toutes les rotations dès le chargement plutôt qu'à la volée
+    if prerotate:
+        rotation_cache.warm(image_data)
+        # Moitiés sous la clé des FruitSlice : (type, côté)
+        rotation_cache.warm({(kind, side): half for (kind, _, side), half in half_sprites.items()})
+    return image_data
@@ -0,0 +1,124 @@
+""" Atlas des sprites : toutes les images du jeu dans un seul fichier
+
+Étape de build : les PNG sont décodés et mis à l'échelle (60x60) une fois pour
+toutes, puis rangés dans une grille stockée en pixels bruts 32 bits avec son index.
+Au lancement, le jeu projette le fichier en mémoire (mmap) et découpe une
+sous-surface par sprite : aucun décodage PNG ni copie des pixels.
+
+Les canaux sont rangés dans l'ordre BGRA, celui des surfaces convert_alpha() :
+les sprites se blittent alors aussi vite que des images converties.
+
+Format (little-endian) :
+    en-tête : "FSAT", version (u8), largeur (u16), hauteur (u16), taille de l'index (u32),
+              ordre des canaux (4 octets, ex : "BGRA")
+    index : JSON {"sprites": {nom: [x, y, largeur, hauteur]},
+                  "sources": {nom: [taille, date de modification (ns)] ou null si l'image manquait}}
+    pixels : largeur * hauteur * 4 octets, alignés sur 16 octets
+
+Build : python atlas.py (à relancer quand une image change). Au lancement, un
+atlas dont une image source a changé, est apparue ou a disparu est ignoré
+(voir AtlasBundle.stale) et le jeu charge les PNG.
+"""
+import json
+import math
+import mmap
+import os
+import struct
+import pygame
+from settings import *
+
+ATLAS_FILE = "image/sprites.atlas"
+SPRITE_SIZE = 60
+MAGIC = b"FSAT"
+VERSION = 2
+HEADER = struct.Struct("<4sBHHI4s")
+ALIGN = 16
+PIXEL_FORMAT = "BGRA"  # Même disposition que les surfaces converties (pas de conversion au blit)
+
+
+def source_stamp(path):
+    """[taille, date de modification] d'une image source, None si elle manque"""
+    if path is None:
+        return None
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def build_bundle(sprites, path=ATLAS_FILE, size=SPRITE_SIZE, sources=None):
+    """Écrit l'atlas à partir de {nom: surface} (chaque sprite est mis à size x size)
+
+    sources : {nom: chemin de l'image source (None si absente)}, pour détecter un atlas périmé
+    """
+    names = list(sprites)
+    cols = max(1, math.ceil(math.sqrt(len(names))))
+    rows = max(1, math.ceil(len(names) / cols))
+    sheet = pygame.Surface((cols * size, rows * size), pygame.SRCALPHA)
+    sheet.fill((0, 0, 0, 0))
+    index = {}
+    for i, name in enumerate(names):
+        x, y = (i % cols) * size, (i // cols) * size
+        image = sprites[name]
+        if image.get_size() != (size, size):
+            image = pygame.transform.scale(image, (size, size))
+        sheet.blit(image, (x, y))
+        index[name] = [x, y, size, size]
+
+    stamps = {name: source_stamp(file) for name, file in (sources or {}).items()}
+    index_bytes = json.dumps({"sprites": index, "sources": stamps}).encode("utf-8")
+    header_size = HEADER.size + len(index_bytes)
+    padding = -header_size % ALIGN
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, sheet.get_width(), sheet.get_height(),
+                            len(index_bytes), PIXEL_FORMAT.encode("ascii")))
+        f.write(index_bytes)
+        f.write(b"\0" * padding)
+        f.write(pygame.image.tobytes(sheet, PIXEL_FORMAT))
+    return path
+
+
+class AtlasBundle:
+    """ Atlas projeté en mémoire : une sous-surface par sprite, sans copie des pixels """
+    def __init__(self, path=ATLAS_FILE):
+        with open(path, "rb") as f:
+            # Le mapping reste valide après la fermeture du fichier
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, width, height, index_size, layout = HEADER.unpack_from(self.map)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} : atlas invalide ou version non supportée")
+        start = HEADER.size
+        index = json.loads(self.map[start:start + index_size].decode("utf-8"))
+        self.index, self.sources = index["sprites"], index["sources"]
+        offset = start + index_size
+        offset += -offset % ALIGN
+        pixels = memoryview(self.map)[offset:offset + width * height * 4]
+        self.sheet = pygame.image.frombuffer(pixels, (width, height), layout.decode("ascii"))
+
+    def stale(self, sources):
+        """Noms dont l'image source ({nom: chemin}) a changé depuis la construction de l'atlas"""
+        return [
+            name for name, file in sources.items()
+            if name not in self.index or self.sources.get(name, False) != source_stamp(file)
+        ]
+
+    def sprites(self):
+        """{nom: sous-surface} (les pixels restent dans le fichier projeté)"""
+        return {name: self.sheet.subsurface(rect) for name, rect in self.index.items()}
+
+
+def main():
+    import os
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    from assets import load_sprite_files, sprite_sources
+
+    path = build_bundle(load_sprite_files(), sources=sprite_sources())
+    print(f"Atlas écrit : {path} ({os.path.getsize(path) // 1024} Ko)")
+
+
+if __name__ == "__main__":
+    main()
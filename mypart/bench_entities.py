@@ -0,0 +1,74 @@
+""" Benchmark des conteneurs d'entités : list.remove() sur copie vs EntityList
+
+Simule une frame de jeu : on parcourt N entités, on en supprime une partie
+(celles qui sortent de l'écran) et on en ajoute autant. Affiche le coût moyen
+par entité et par frame, qui doit rester plat avec EntityList quand N grandit.
+
+Usage : python bench_entities.py [--sizes 10,100,1000,10000] [--frames 200]
+"""
+import argparse
+import random
+import time
+from entities import EntityList
+
+
+class Entity:
+    __slots__ = ("y",)
+
+    def __init__(self, y):
+        self.y = y
+
+
+def frame_list(items, removed):
+    # Ancienne boucle : copie de la liste puis list.remove() en O(n)
+    for e in items[:]:
+        e.y += 1
+        if e.y > 1000:
+            items.remove(e)
+    for _ in range(removed):
+        items.append(Entity(0))
+
+
+def frame_entities(items, removed):
+    # À l'envers : l'entité déplacée par remove() a déjà été traitée
+    for e in reversed(items):
+        e.y += 1
+        if e.y > 1000:
+            items.remove(e)
+    for _ in range(removed):
+        items.append(Entity(0))
+
+
+def run(factory, frame, size, frames, churn, rng):
+    items = factory(Entity(rng.randrange(900)) for _ in range(size))
+    removed = max(1, int(size * churn))
+    elapsed = 0.0
+    for _ in range(frames):
+        # Remet à la limite de l'écran un échantillon aléatoire (hors chrono)
+        for e in rng.sample(list(items), min(removed, len(items))):
+            e.y = 1000
+        t0 = time.perf_counter()
+        frame(items, removed)
+        elapsed += time.perf_counter() - t0
+    return elapsed / (frames * size) * 1e9  # ns par entité et par frame
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="10,100,1000,10000")
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--churn", type=float, default=0.05,
+                        help="fraction des entités supprimées par frame")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{'entités':>8} | {'list.remove':>12} | {'EntityList':>12} | (ns / entité / frame)")
+    for size in (int(n) for n in args.sizes.split(",")):
+        frames = max(5, min(args.frames, args.frames * 1000 // size))
+        old = run(list, frame_list, size, frames, args.churn, random.Random(args.seed))
+        new = run(EntityList, frame_entities, size, frames, args.churn, random.Random(args.seed))
+        print(f"{size:>8} | {old:>12.0f} | {new:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+""" Benchmark du leaderboard SQLite : insertion et calcul de rang sur N entrées synthétiques
+
+Usage : python bench_leaderboard.py [--entries 1000000] [--queries 1000] [--max-score 2000]
+
+Les scores sont tirés entre 0 et --max-score (0-2000 : ordre de grandeur des vraies
+parties) : beaucoup de joueurs par score, comme en jeu.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from leaderboard import SQLiteLeaderboardStore
+
+MODES = ["CLASSIC", "CHALLENGE"]
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+def report(label, samples):
+    print(
+        f"{label:<22} moy {sum(samples) / len(samples) * 1e6:8.1f} µs"
+        f" | p50 {percentile(samples, 50) * 1e6:8.1f} µs"
+        f" | p99 {percentile(samples, 99) * 1e6:8.1f} µs"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--max-score", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as folder:
+        store = SQLiteLeaderboardStore(os.path.join(folder, "bench.db"))
+
+        # 1. Remplissage en une seule transaction
+        t0 = time.perf_counter()
+        with store.db:
+            store.db.executemany(
+                "INSERT INTO scores (name, mode, score) VALUES (?, ?, ?)",
+                (
+                    (f"player{i}", MODES[i % 2], rng.randint(0, args.max_score))
+                    for i in range(args.entries)
+                ),
+            )
+        elapsed = time.perf_counter() - t0
+        print(f"Remplissage : {args.entries} entrées en {elapsed:.2f} s"
+              f" ({args.entries / elapsed:,.0f} entrées/s)")
+
+        # 2. Ajouts unitaires (une transaction par partie, comme en jeu)
+        samples = []
+        for i in range(args.queries):
+            t0 = time.perf_counter()
+            store.add(f"bench{i}", rng.randint(0, args.max_score), MODES[i % 2])
+            samples.append(time.perf_counter() - t0)
+        report("add()", samples)
+
+        # 3. Rang de joueurs existants (global et par mode)
+        targets = []
+        for i in range(args.queries):
+            name, mode = f"player{rng.randrange(args.entries)}", MODES[0]
+            row = store.db.execute(
+                "SELECT name, score, mode FROM scores WHERE name = ?", (name,)
+            ).fetchone()
+            targets.append(row)
+        for per_mode in (False, True):
+            samples = []
+            for name, sc, mode in targets:
+                t0 = time.perf_counter()
+                store.rank(name, sc, mode, per_mode=per_mode)
+                samples.append(time.perf_counter() - t0)
+            report("rank(per_mode=%s)" % per_mode, samples)
+
+        # 4. Pages du top
+        samples = []
+        for i in range(args.queries):
+            t0 = time.perf_counter()
+            store.top(10, offset=(i % 100) * 10)
+            samples.append(time.perf_counter() - t0)
+        report("top(10, offset)", samples)
+
+        store.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import random
+from settings import *
+from game import BONUS_KEYS, FRUIT_KEYS, MAX_GAUGE, TICK_MS
+
+
+class AutoPlayer:
+    """ Joueur automatique : tape la lettre des objets à l'écran en évitant les bombes
+
+    reaction_ms : délai entre l'apparition d'un objet à l'écran et le premier appui
+    accuracy : probabilité d'appuyer sur la bonne lettre (sinon une autre, jamais une bombe)
+    keys_per_second : cadence maximale d'appui
+
+    Le bot raisonne en pas de simulation : avec la même graine il rejoue la même partie.
+    """
+    def __init__(self, reaction_ms=250, accuracy=0.95, keys_per_second=8, seed=None):
+        self.reaction_ticks = round(reaction_ms / TICK_MS)
+        self.accuracy = accuracy
+        self.interval = TICK_RATE / keys_per_second  # Pas entre deux appuis
+        self.rng = random.Random(seed)
+        self.reset()
+
+    def reset(self):
+        self.first_seen = {}  # objet -> pas où il est apparu à l'écran
+        self.next_tick = 0
+        self.presses = self.mistakes = 0
+
+    def keys(self, session):
+        """Touches à appuyer avant le prochain pas de simulation"""
+        tick = session.ticks
+        seen = self.first_seen
+        self.first_seen = {
+            obj: seen.get(obj, tick) for obj in session.active_objects if obj.y < HEIGHT
+        }
+        if tick < self.next_tick:
+            return []
+
+        if session.is_overcharged and session.special_gauge >= MAX_GAUGE:
+            self.next_tick = tick + self.interval
+            self.presses += 1
+            return ["space"]
+
+        # L'objet le plus urgent parmi ceux vus depuis assez longtemps
+        best, best_steps = None, None
+        for letter in BONUS_KEYS + FRUIT_KEYS:
+            target = session.target(letter)
+            if target is None or target.type == "bomb":
+                continue
+            appeared = self.first_seen.get(target)
+            if appeared is None or tick - appeared < self.reaction_ticks:
+                continue
+            # Même mesure d'urgence que l'index des lettres de GameSession
+            steps = target.exit_steps()
+            if best is None or steps < best_steps:
+                best, best_steps = letter, steps
+        if best is None:
+            return []
+
+        self.next_tick = tick + self.interval
+        self.presses += 1
+        if self.rng.random() < self.accuracy:
+            return [best]
+        # Erreur de frappe : une autre lettre, mais jamais une qui viserait une bombe
+        self.mistakes += 1
+        safe = [
+            letter for letter in BONUS_KEYS + FRUIT_KEYS
+            if letter != best and getattr(session.target(letter), "type", None) != "bomb"
+        ]
+        return [self.rng.choice(safe)] if safe else []
@@ -0,0 +1,49 @@
+import pygame
+
+
+class DirtyRectRenderer:
+    """ Écrans statiques : ne redessine et ne pousse que les widgets qui ont changé
+
+    Chaque frame, l'écran déclare ses widgets sous la forme {nom: (zone, état)}.
+    Si aucun état n'a changé, rien n'est redessiné ni envoyé à l'écran ; sinon
+    seules les zones modifiées sont poussées avec pygame.display.update(rects).
+    """
+    def __init__(self, size):
+        self.screen_rect = pygame.Rect((0, 0), size)
+        self.page = None
+        self.previous = {}
+        self.frames = self.skipped = 0
+        self.pushed_pixels = 0
+
+    def invalidate(self):
+        """Force un rafraîchissement complet au prochain appel (ex : retour d'un écran animé)"""
+        self.page = None
+
+    def update(self, page, widgets):
+        """Retourne la liste des zones à pousser (liste vide : rien à redessiner)"""
+        self.frames += 1
+        if page != self.page:
+            rects = [self.screen_rect]
+        else:
+            rects = []
+            for name, (rect, state) in widgets.items():
+                old = self.previous.get(name)
+                if old is None or old[1] != state or old[0] != rect:
+                    rects.append(rect)
+                    if old is not None and old[0] != rect:
+                        rects.append(old[0])
+        self.page = page
+        self.previous = widgets
+        if not rects:
+            self.skipped += 1
+        self.pushed_pixels += sum(r.clip(self.screen_rect).width * r.clip(self.screen_rect).height for r in rects)
+        return rects
+
+    def stats(self):
+        full = self.screen_rect.width * self.screen_rect.height
+        return {
+            "frames": self.frames,
+            "skipped": self.skipped,
+            # Fraction des pixels envoyés par rapport à un flip() complet à chaque frame
+            "pushed_ratio": self.pushed_pixels / (full * self.frames) if self.frames else 0.0,
+        }
@@ -0,0 +1,55 @@
+class EntityList:
+    """ Liste d'entités avec suppression en O(1)
+
+    remove() met la dernière entité à la place de celle retirée (position
+    gardée dans _index) : pas de recherche ni de décalage, pas de compactage.
+    L'itération parcourt directement la liste, sans filtre ni copie.
+
+    Une boucle qui retire l'entité courante parcourt la liste à l'envers
+    (reversed) : la dernière entité, déplacée à sa place, a alors déjà été
+    traitée. L'ordre d'affichage n'est donc pas conservé après une suppression.
+    """
+    def __init__(self, items=()):
+        self.items = []
+        self._index = {}  # id(entité) -> position dans items
+        self.extend(items)
+
+    def append(self, obj):
+        self._index[id(obj)] = len(self.items)
+        self.items.append(obj)
+
+    def extend(self, objs):
+        for obj in objs:
+            self.append(obj)
+
+    def remove(self, obj):
+        i = self._index.pop(id(obj), None)
+        if i is None:
+            raise ValueError("EntityList.remove(x): x not in list")
+        last = self.items.pop()
+        if last is not obj:
+            self.items[i] = last
+            self._index[id(last)] = i
+
+    def discard(self, obj):
+        if id(obj) in self._index:
+            self.remove(obj)
+
+    def clear(self):
+        self.items.clear()
+        self._index.clear()
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __reversed__(self):
+        return reversed(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __bool__(self):
+        return bool(self.items)
+
+    def __contains__(self, obj):
+        return id(obj) in self._index
@@ -0,0 +1,135 @@
+""" Polices : la famille système est résolue une seule fois en fichier TTF
+
+pygame.font.SysFont parcourt la liste des polices du système (fc-list sous
+Linux) à chaque lancement. FontManager fait cette recherche une fois, garde le
+chemin du TTF trouvé dans FONT_CACHE_FILE (clé : familles + gras/italique) puis
+ouvre directement pygame.font.Font(chemin, taille).
+
+Une police livrée avec le jeu (BUNDLED_FONT) passe avant les polices système.
+Sans police trouvée, on utilise la police par défaut de pygame (comme SysFont) ;
+cet échec n'est pas gardé en cache, la recherche est refaite au lancement suivant.
+Les deux fichiers sont cherchés dans le dossier du jeu, pas dans le dossier courant.
+
+Mesure : python fonts.py
+"""
+import json
+import os
+import time
+import pygame
+from registry import BASE_DIR
+
+FONT_FAMILIES = ["impact", "arialblack", "arial"]
+BUNDLED_FONT = os.path.join(BASE_DIR, "font", "game.ttf")  # Optionnelle : utilisée si le fichier existe
+FONT_CACHE_FILE = os.path.join(BASE_DIR, "font_cache.json")
+
+
+class FontManager:
+    """ Polices par taille, à partir d'un chemin TTF résolu une fois et gardé sur disque """
+    def __init__(self, families=FONT_FAMILIES, bold=False, italic=False,
+                 bundled=BUNDLED_FONT, cache_file=FONT_CACHE_FILE):
+        self.families = families
+        self.bold, self.italic = bold, italic
+        self.bundled = bundled
+        self.cache_file = cache_file
+        self.fonts = {}  # taille -> pygame.font.Font
+        self.path = None
+        self.source = None  # "bundled", "cache" ou "system"
+
+    def key(self):
+        return f"{','.join(self.families)}|bold={int(self.bold)}|italic={int(self.italic)}"
+
+    def _read_cache(self):
+        try:
+            with open(self.cache_file) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_cache(self, data):
+        try:
+            with open(self.cache_file, "w") as f:
+                json.dump(data, f, indent=2)
+        except OSError as e:
+            print(f"Cache des polices non écrit : {e}")
+
+    def resolve(self):
+        """Chemin du TTF à ouvrir (None : police par défaut de pygame)"""
+        if self.source is not None:
+            return self.path
+        if self.bundled and os.path.exists(self.bundled):
+            self.path, self.source = self.bundled, "bundled"
+            return self.path
+
+        key = self.key()
+        data = self._read_cache()
+        path = data.get(key)
+        # Une police désinstallée depuis invalide l'entrée
+        if path is not None and os.path.exists(path):
+            self.path, self.source = path, "cache"
+            return self.path
+
+        self.path = pygame.font.match_font(self.families, self.bold, self.italic)
+        self.source = "system"
+        # Seul un chemin trouvé est gardé : une police installée plus tard sera vue
+        if self.path is not None:
+            data[key] = self.path
+            self._write_cache(data)
+        elif key in data:
+            del data[key]
+            self._write_cache(data)
+        return self.path
+
+    def get(self, size):
+        font = self.fonts.get(size)
+        if font is None:
+            font = pygame.font.Font(self.resolve(), size)
+            # Police par défaut : gras/italique simulés, comme le fait SysFont
+            if self.path is None:
+                font.set_bold(self.bold)
+                font.set_italic(self.italic)
+            self.fonts[size] = font
+        return font
+
+
+def _forget_system_fonts():
+    """Vide la liste des polices que pygame garde en mémoire (mesure d'un lancement à froid)"""
+    pygame.sysfont.Sysfonts.clear()
+    pygame.sysfont.Sysalias.clear()
+    pygame.sysfont.is_init = False
+
+
+def main():
+    """Compare SysFont avec FontManager (cache vide, puis cache sur disque), à froid"""
+    sizes = [35, 22, 50, 16]
+    pygame.font.init()
+    cache_file = FONT_CACHE_FILE + ".bench"
+
+    def timed(load):
+        _forget_system_fonts()
+        start = time.perf_counter()
+        load()
+        return (time.perf_counter() - start) * 1000
+
+    def with_manager():
+        manager = FontManager(bundled=None, cache_file=cache_file)
+        for size in sizes:
+            manager.get(size)
+        return manager
+
+    sysfont_ms = timed(lambda: [pygame.font.SysFont(FONT_FAMILIES, size) for size in sizes])
+    timings = {
+        "cache vide": timed(with_manager),
+        "cache sur disque": timed(with_manager),
+    }
+    manager = with_manager()
+    if os.path.exists(cache_file):  # Pas écrit si aucune police n'a été trouvée
+        os.remove(cache_file)
+
+    print(f"Police : {manager.path or 'police par défaut de pygame'}")
+    print(f"SysFont          : {sysfont_ms:7.2f} ms pour {len(sizes)} tailles")
+    for label, ms in timings.items():
+        print(f"{label:<17}: {ms:7.2f} ms (gain {sysfont_ms - ms:+.2f} ms)")
+
+
+if __name__ == "__main__":
+    main()
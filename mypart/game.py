@@ -0,0 +1,396 @@
+import heapq
+import random
+import time
+import pygame
+from settings import *
+from entities import EntityList
+from models import (
+    SPECIAL_TYPES, array_pools, lightning_pool, object_pool, slice_pool,
+    rng as entity_rng,
+)
+from particles import ParticleSystem
+from profiler import FrameProfiler
+from render import RenderQueue
+
+MAX_GAUGE = 100
+TICK_MS = 1000 / TICK_RATE  # Durée simulée d'un pas (ms)
+CHALLENGE_TICKS = 60 * TICK_RATE  # 60 secondes
+BONUS_TICKS = 5 * TICK_RATE  # Durée du glaçon et de la surcharge
+STORM_RAMP = 2  # Mode Tempête : objets en plus par vague à chaque seconde (sans plafond)
+STORM_CUT_TICKS = 10  # Mode Tempête : coupe automatique (plus courte que la vie des particules)
+BONUS_KEYS = "awsd"
+FRUIT_KEYS = "jkl"
+
+
+class GameSession:
+    """ État et logique d'une partie (spawn, touches, timers, mouvements), sans fenêtre
+
+    Modes : CLASSIC, CHALLENGE et STORM (Tempête : vagues sans plafond qui servent
+    de test de capacité, voir CapacityMeter).
+    physics : "python" (un objet à la fois) ou "numpy" (tous les objets et morceaux
+    avancés d'un coup dans des tableaux, voir PhysicsWorld)
+    """
+    def __init__(self, image_data, play_sound=None, profiler=None, physics="python"):
+        self.image_data = image_data
+        self.physics = physics
+        if physics == "numpy":
+            # Un PhysicsWorld par session (voir array_pools)
+            self.object_pool, self.slice_pool = array_pools()
+        else:
+            self.object_pool, self.slice_pool = object_pool, slice_pool
+        # Les sons sont optionnels : en mode headless on ne joue rien
+        self.play_sound = play_sound or (lambda name: None)
+        # Profiler désactivé par défaut (ses chronos sont alors des no-op)
+        self.profiler = profiler or FrameProfiler()
+        self.particles = ParticleSystem()
+        self.render_queue = RenderQueue()
+        # Appelé avec (début, fin) de chaque découpe (mesure de latence, voir LatencyTracker)
+        self.cut_listener = None
+        # Tremblement d'écran : générateur séparé, l'affichage ne doit pas changer la partie
+        self.shake_rng = random.Random()
+        self.reset("CLASSIC")
+
+    def reset(self, mode, seed=None):
+        """Réinitialise la partie (les entités restantes retournent dans leurs réserves)
+
+        seed : graine de tous les générateurs aléatoires (tirée au hasard si None),
+        la même graine et les mêmes touches redonnent la même partie
+        """
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        self.seed = seed
+        entity_rng.seed(seed)
+        self.particles.seed(seed)
+        self.shake_rng.seed(seed + 1)
+        for obj in getattr(self, "active_objects", ()):
+            self.release(self.object_pool, obj)
+        for s in getattr(self, "slices", ()):
+            self.release(self.slice_pool, s)
+        for l in getattr(self, "lightning_effects", ()):
+            lightning_pool.release(l)
+        self.sub_mode = mode
+        self.score, self.lives = 0, 3
+        # Suppression en O(1), les boucles qui retirent parcourent à l'envers (voir EntityList)
+        self.active_objects, self.slices = EntityList(), EntityList()
+        self.slashes, self.lightning_effects = EntityList(), EntityList()
+        # Index des objets vivants par lettre : tas (pas de sortie prévu, n° d'ajout, objet),
+        # le plus urgent en tête (voir add_object)
+        self.by_letter = {letter: [] for letter in BONUS_KEYS + FRUIT_KEYS}
+        self.motion_ticks = 0  # Pas où les objets ont bougé (le glaçon les fige tous)
+        self.index_seq = 0
+        self.particles.clear()
+        self.speed_multiplier, self.shake_intensity, self.flash_timer = 1.0, 0, 0
+        self.challenge_timer, self.is_iced, self.ice_timer = CHALLENGE_TICKS, False, 0
+        self.is_overcharged, self.overcharge_timer, self.special_gauge = False, 0, 0
+        self.combo_timer = self.combo_count = 0
+        self.spawn_timer = 900  # Délai (ms) avant la prochaine vague
+        self.game_over = False
+        self.ticks = 0
+
+    def release(self, pool, entity):
+        """Rend une entité à sa réserve (et sa colonne à son PhysicsWorld)"""
+        if self.physics == "numpy":
+            entity.world.detach(entity)
+        pool.release(entity)
+
+    def add_object(self, obj):
+        """Ajoute l'objet à la partie et à l'index de sa lettre
+
+        La gravité est la même pour tous et le glaçon fige tous les objets : le pas
+        de sortie prévu (motion_ticks + exit_steps) ne change plus, l'ordre du tas reste juste.
+        """
+        self.active_objects.append(obj)
+        self.index_seq += 1
+        obj.index_seq = self.index_seq
+        heapq.heappush(
+            self.by_letter.setdefault(obj.letter, []),
+            (self.motion_ticks + obj.exit_steps(), self.index_seq, obj),
+        )
+
+    def remove_object(self, obj):
+        self.active_objects.remove(obj)
+        # L'entrée reste dans le tas, périmée : retirée dès qu'elle arrive en tête
+        obj.index_seq = -1
+        heap = self.by_letter[obj.letter]
+        while heap and heap[0][2].index_seq != heap[0][1]:
+            heapq.heappop(heap)
+        self.release(self.object_pool, obj)
+
+    def target(self, letter):
+        """Objet le plus urgent qui porte `letter` (None s'il n'y en a pas), en O(1)
+
+        remove_object() purge la tête du tas : elle est toujours un objet vivant.
+        """
+        heap = self.by_letter.get(letter)
+        return heap[0][2] if heap else None
+
+    def end_game(self):
+        self.game_over = True
+
+    def add_slash(self, y):
+        self.slashes.append({"start": (0, y), "end": (WIDTH, y), "life": 255})
+
+    # Fonction pour couper tous les objets non-bombes à l'écran
+    def trigger_area_cut(self, particle_color=WHITE):
+        """Coupe tous les objets non-bombes à l'écran"""
+        targets = [obj for obj in self.active_objects if obj.type != "bomb"]
+        count = len(targets)
+        for obj in targets:
+            # Calcul du score bonus
+            if particle_color == GOLD and count > 1:
+                self.score += count - 1
+            else:
+                self.score += count
+
+            self.cut(obj, particle_color, PARTICLES_PER_AREA_CUT)
+            self.remove_object(obj)
+
+    def cut(self, obj, particle_color, particle_count):
+        """Moitiés et particules d'un objet coupé"""
+        start = time.perf_counter() if self.cut_listener else 0.0
+        self.slices.extend(
+            [
+                self.slice_pool.acquire(obj.image_orig, obj.x, obj.y, "left", obj.type),
+                self.slice_pool.acquire(obj.image_orig, obj.x, obj.y, "right", obj.type),
+            ]
+        )
+        self.particles.emit(obj.x + 30, obj.y + 30, particle_color, particle_count)
+        if self.cut_listener:
+            self.cut_listener(start, time.perf_counter())
+
+    def storm_cut(self):
+        """Mode Tempête : coupe automatiquement les fruits qui redescendent (sans score)"""
+        for obj in reversed(self.active_objects):
+            if obj.vy > 0 and obj.type not in SPECIAL_TYPES:
+                self.cut(obj, WHITE, PARTICLES_PER_CUT)
+                self.remove_object(obj)
+
+    def entity_counts(self):
+        return {
+            "objects": len(self.active_objects),
+            "slices": len(self.slices),
+            "particles": len(self.particles),
+        }
+
+    def spawn(self):
+        """Lance une vague d'objets et programme la suivante"""
+        if not self.is_iced:
+            spawn_count = min(4, 1 + (self.score // 1000))
+            if self.sub_mode == "STORM":
+                spawn_count = 1 + STORM_RAMP * (self.ticks // TICK_RATE)
+            elif self.is_overcharged:
+                spawn_count = 6
+            for _ in range(spawn_count):
+                self.add_object(
+                    self.object_pool.acquire(
+                        self.image_data, self.is_overcharged, self.speed_multiplier
+                    )
+                )
+
+        # Accélération du jeu
+        base_delay = max(400, 900 - (self.score // 10))
+        self.spawn_timer = 300 if self.is_overcharged or self.sub_mode == "STORM" else base_delay
+
+    def press_key(self, key_pressed):
+        """Traite une touche (nom pygame en minuscules). Retourne l'objet touché ou None"""
+        if self.game_over:
+            return None
+
+        # Capacité spéciale "Grand Slash"
+        if key_pressed == "space" and self.is_overcharged and self.special_gauge >= MAX_GAUGE:
+            self.add_slash(HEIGHT // 2)
+            self.trigger_area_cut(ELECTRIC_ORANGE)
+            self.play_sound("slash")
+            self.special_gauge = 0
+            self.shake_intensity = 25
+
+        # Détection de collision (touche clavier) : les bonus portent toujours une
+        # lettre de BONUS_KEYS et les fruits une lettre de FRUIT_KEYS, il suffit donc
+        # de regarder les objets qui portent la lettre. Le plus urgent est touché en premier.
+        obj = self.target(key_pressed)
+        if obj is None:
+            return None
+        self.hit_object(obj)
+        return obj
+
+    def hit_object(self, obj):
+        """Applique l'effet d'une touche sur un objet"""
+        obj.hp -= 1
+        if obj.hp > 0:
+            return
+        if obj.type == "bomb":
+            self.play_sound("bomb")
+            self.lives = 0
+            self.shake_intensity = 50
+            self.end_game()
+        elif obj.is_enrobed:
+            self.play_sound("halo")
+            self.score += 1
+            self.flash_timer, self.shake_intensity = 10, 25
+            self.trigger_area_cut(GOLD)
+        elif obj.type == "lightning":
+            self.play_sound("lightning")
+            self.score += 1
+            self.is_overcharged, self.overcharge_timer = True, BONUS_TICKS
+        elif obj.type == "shuriken":
+            self.play_sound("slash")
+            self.score += 1
+            self.add_slash(obj.y + 30)
+            self.trigger_area_cut(WHITE)
+        elif obj.type == "ice_block":
+            self.play_sound("ice")
+            self.score += 1
+            self.is_iced, self.ice_timer = True, BONUS_TICKS
+        else:
+            # Fruit classique + Combo
+            self.play_sound("fruit_cut")
+            if self.combo_timer > 0:
+                self.score += 2
+                self.combo_count += 1
+            else:
+                self.score += 1
+                self.combo_count = 1
+            self.combo_timer = COMBO_THRESHOLD
+            if self.is_overcharged:
+                self.special_gauge = min(MAX_GAUGE, self.special_gauge + 10)
+
+            self.cut(obj, WHITE, PARTICLES_PER_CUT)
+
+        if obj in self.active_objects:
+            self.remove_object(obj)
+
+    def tick(self):
+        """Avance la simulation d'un pas (1 / TICK_RATE seconde)"""
+        if self.game_over:
+            return
+        self.ticks += 1
+
+        # --- Gestion du spawn des objets ---
+        with self.profiler.phase("spawn"):
+            self.spawn_timer -= TICK_MS
+            if self.spawn_timer <= 0:
+                self.spawn()
+            if self.sub_mode == "STORM" and self.ticks % STORM_CUT_TICKS == 0:
+                self.storm_cut()
+
+        with self.profiler.phase("timers"):
+            self.update_timers()
+
+        with self.profiler.phase("update"):
+            self.update_entities()
+
+        self.shake_intensity = max(0, self.shake_intensity - 1)
+        if self.sub_mode == "CLASSIC" and self.lives <= 0:
+            self.end_game()
+
+    def update_timers(self):
+        """Timers du combo, des bonus et du mode Challenge"""
+        if self.combo_timer > 0:
+            self.combo_timer -= 1
+        if self.is_iced:
+            self.ice_timer -= 1
+            self.is_iced = self.ice_timer > 0
+        else:
+            # On ne baisse le chrono Challenge QUE si le gel est inactif
+            if self.sub_mode == "CHALLENGE":
+                self.challenge_timer -= 1
+                if self.challenge_timer <= 0:
+                    self.end_game()
+
+        if self.is_overcharged:
+            self.overcharge_timer -= 1
+            if self.overcharge_timer <= 0:
+                self.is_overcharged = False
+                self.add_slash(HEIGHT // 2)
+                self.trigger_area_cut(ELECTRIC_ORANGE)
+                self.play_sound("slash")
+                self.shake_intensity = 25
+            elif entity_rng.random() < 0.2:
+                self.lightning_effects.append(lightning_pool.acquire())
+        for l in reversed(self.lightning_effects):
+            l.update()
+            if l.life <= 0:
+                self.lightning_effects.remove(l)
+                lightning_pool.release(l)
+
+    def update_entities(self):
+        """Particules, morceaux de fruits, objets et traits de coupe"""
+        # 2. Animations (Particules et morceaux de fruits)
+        self.particles.update()
+
+        if not self.is_iced:
+            self.motion_ticks += 1
+        if self.physics == "numpy":
+            # Morceaux et objets avancés d'un coup, seuls les sortis repassent en Python
+            for s in self.slice_pool.cls.world.step():
+                self.slices.remove(s)
+                self.release(self.slice_pool, s)
+            for obj in self.object_pool.cls.world.step(is_slowed=self.is_iced):
+                self.object_fell(obj)
+        else:
+            for s in reversed(self.slices):
+                s.update()
+                if s.y > HEIGHT + 100:
+                    self.slices.remove(s)
+                    self.release(self.slice_pool, s)
+
+            # 3. Mouvement des objets principaux (Fruits non coupés)
+            for obj in reversed(self.active_objects):
+                obj.move(is_slowed=self.is_iced)
+                if obj.y > HEIGHT + 100:
+                    self.object_fell(obj)
+
+        # 4. Traits de coupe
+        for sl in reversed(self.slashes):
+            sl["life"] -= 50
+            if sl["life"] <= 0:
+                self.slashes.remove(sl)
+
+    def object_fell(self, obj):
+        """Objet sorti par le bas : vie perdue si c'était un fruit (mode Classique)"""
+        if not self.is_iced and not self.is_overcharged:
+            if (
+                obj.type not in ["bomb", "ice_block", "lightning"]
+                and self.sub_mode == "CLASSIC"
+            ):
+                self.lives -= 1
+        self.remove_object(obj)
+
+    def shake_offset(self):
+        """Décalage de l'écran pour le tremblement en cours"""
+        if self.shake_intensity <= 0:
+            return [0, 0]
+        return [
+            self.shake_rng.randint(-self.shake_intensity, self.shake_intensity),
+            self.shake_rng.randint(-self.shake_intensity, self.shake_intensity),
+        ]
+
+    def draw(self, surf, alpha=1.0):
+        """Dessine les entités de la partie (sans le fond ni l'interface)
+
+        alpha : fraction du pas en cours (0..1) pour interpoler les positions
+        """
+        queue = self.render_queue
+        # Une couche = un seul appel blits (particules, morceaux, puis objets)
+        self.particles.draw(surf, alpha)
+        if self.physics == "numpy":
+            # Interpolation de tous les corps d'un coup (listes indexées par slot)
+            xs, ys, angles = self.slice_pool.cls.world.interpolate(alpha)
+            for s in self.slices:
+                s.enqueue(queue, xs[s.slot], ys[s.slot], angles[s.slot])
+        else:
+            for s in self.slices:
+                s.enqueue(queue, *s.interpolate(alpha))
+        queue.flush(surf)
+        for l in self.lightning_effects:
+            l.draw(surf)
+        if self.physics == "numpy":
+            xs, ys, angles = self.object_pool.cls.world.interpolate(alpha)
+            for obj in self.active_objects:
+                obj.enqueue(queue, xs[obj.slot], ys[obj.slot], angles[obj.slot])
+        else:
+            for obj in self.active_objects:
+                obj.enqueue(queue, *obj.interpolate(alpha))
+        queue.flush(surf)
+        for sl in self.slashes:
+            pygame.draw.line(surf, WHITE, sl["start"], sl["end"], 15)
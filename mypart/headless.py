@@ -0,0 +1,205 @@
+""" Mode sans affichage : fait tourner la logique du jeu aussi vite que possible
+
+Utilise les drivers SDL "dummy" (pas de fenêtre ni de son) et pilote GameSession
+avec des entrées scriptées. Pratique pour les tests de non-régression et
+l'équilibrage sur une machine sans écran.
+
+Usage : python headless.py [--games 10] [--mode CLASSIC] [--script touches.txt]
+                           [--random-keys 8] [--seed 1] [--render] [--physics numpy]
+        python headless.py --replay replays/partie.fsr [--render]
+        python headless.py --bot [--reaction-ms 250] [--accuracy 0.95] [--kps 8]
+                           [--soak-minutes 120] [--soak-interval 60]
+
+Format du script : une ligne "frame touche" par appui (ex : "120 j").
+
+Avec --bot, un AutoPlayer joue à la place du script. Avec --soak-minutes, les
+parties s'enchaînent pendant la durée donnée (test d'endurance) et l'évolution
+des temps de frame, du score et de la mémoire est exportée dans soak_*.json.
+
+Mode STORM : la partie continue jusqu'à saturation et affiche le nombre maximum
+d'objets, de morceaux et de particules tenus à 60 FPS (temps de calcul de chaque
+frame, rendu compris avec --render).
+"""
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import random
+import sys
+import time
+import pygame
+from settings import *
+
+pygame.init()
+# Une surface d'affichage est nécessaire pour convert_alpha() dans load_game_assets()
+pygame.display.set_mode((1, 1))
+
+from assets import load_game_assets
+from game import GameSession, TICK_MS
+from profiler import CapacityMeter
+from replay import Replay
+from bot import AutoPlayer
+from profiler import SoakMonitor
+
+ALL_KEYS = "awsdjkl"
+
+
+def load_script(path):
+    """Lit un script d'entrées : {frame: [touches]}"""
+    script = {}
+    with open(path, "r") as f:
+        for line in f:
+            line = line.split("#")[0].strip()
+            if not line:
+                continue
+            tick, key = line.split()
+            script.setdefault(int(tick), []).append(key.lower())
+    return script
+
+
+def random_script(rng, max_ticks, every):
+    """Script aléatoire : une touche toutes les `every` frames"""
+    return {tick: [rng.choice(ALL_KEYS)] for tick in range(every, max_ticks, every)}
+
+
+def run_game(session, mode="CLASSIC", script=None, max_ticks=60 * 60 * 10, surface=None,
+             meter=None, seed=None, bot=None, soak=None):
+    """Joue une partie complète sans limite de FPS et retourne un résumé
+
+    meter : CapacityMeter alimenté avec la durée de chaque frame (la partie
+    s'arrête quand il est saturé)
+    seed : graine de la partie (voir GameSession.reset)
+    bot : AutoPlayer qui joue à la place du script
+    soak : SoakMonitor alimenté avec la durée de chaque frame
+    """
+    script = script or {}
+    session.reset(mode, seed)
+    if bot is not None:
+        bot.reset()
+    t0 = frame_start = time.perf_counter()
+    while not session.game_over and session.ticks < max_ticks:
+        keys = bot.keys(session) if bot is not None else script.get(session.ticks, ())
+        for key in keys:
+            session.press_key(key)
+        session.tick()
+        if surface is not None:
+            surface.fill(DARK_BLUE)
+            session.draw(surface)
+        if meter is not None or soak is not None:
+            now = time.perf_counter()
+            frame_ms = (now - frame_start) * 1000
+            frame_start = now
+            if soak is not None:
+                soak.frame(frame_ms, session)
+            if meter is not None:
+                meter.add(frame_ms, session.entity_counts())
+                if meter.failed:
+                    break
+    if soak is not None:
+        soak.game_over(session)
+    elapsed = time.perf_counter() - t0
+    game_seconds = session.ticks * TICK_MS / 1000
+    return {
+        "mode": mode,
+        "seed": session.seed,
+        "score": session.score,
+        "ticks": session.ticks,
+        "game_seconds": game_seconds,
+        "elapsed": elapsed,
+        "speedup": game_seconds / elapsed if elapsed else float("inf"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--games", type=int, default=1)
+    parser.add_argument("--mode", default="CLASSIC", choices=["CLASSIC", "CHALLENGE", "STORM"])
+    parser.add_argument("--script", help="fichier d'entrées (frame touche)")
+    parser.add_argument("--random-keys", type=int, default=0, metavar="N",
+                        help="appuie une touche au hasard toutes les N frames")
+    parser.add_argument("--max-ticks", type=int, default=60 * 60 * 10)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--render", action="store_true",
+                        help="dessine aussi chaque frame (hors écran)")
+    parser.add_argument("--physics", default="python", choices=["python", "numpy"])
+    parser.add_argument("--replay", help="rejoue un replay enregistré et vérifie son score")
+    parser.add_argument("--bot", action="store_true", help="un AutoPlayer joue les parties")
+    parser.add_argument("--reaction-ms", type=float, default=250)
+    parser.add_argument("--accuracy", type=float, default=0.95)
+    parser.add_argument("--kps", type=float, default=8, help="touches par seconde (bot)")
+    parser.add_argument("--soak-minutes", type=float,
+                        help="enchaîne les parties pendant cette durée (test d'endurance)")
+    parser.add_argument("--soak-interval", type=float, default=60,
+                        help="secondes entre deux relevés du test d'endurance")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    session = GameSession(load_game_assets(), physics=args.physics)
+    surface = pygame.Surface((WIDTH, HEIGHT)) if args.render else None
+
+    if args.replay:
+        replay = Replay.load(args.replay)
+        result = run_game(session, replay.mode, replay.script(), replay.ticks, surface,
+                          seed=replay.seed)
+        same = (result["ticks"], result["score"]) == (replay.ticks, replay.score)
+        print(
+            f"Replay {replay.mode} (graine {replay.seed}) : score {result['score']}"
+            f" en {result['ticks']} frames, attendu {replay.score} en {replay.ticks}"
+            f" -> {'identique' if same else 'DIFFÉRENT'} | x{result['speedup']:.0f} temps réel"
+        )
+        sys.exit(0 if same else 1)
+
+    bot = None
+    if args.bot:
+        bot = AutoPlayer(args.reaction_ms, args.accuracy, args.kps, seed=args.seed)
+    soak = SoakMonitor(args.soak_interval) if args.soak_minutes else None
+
+    game = 0
+    while game < args.games or (soak and time.perf_counter() - soak.start < args.soak_minutes * 60):
+        if args.script:
+            script = load_script(args.script)
+        elif args.random_keys:
+            script = random_script(rng, args.max_ticks, args.random_keys)
+        else:
+            script = {}
+        meter = CapacityMeter() if args.mode == "STORM" else None
+        seed = rng.randrange(2 ** 32) if args.seed is not None else None
+        result = run_game(session, args.mode, script, args.max_ticks, surface, meter, seed,
+                          bot, soak)
+        game += 1
+        if soak is not None:
+            continue
+        print(
+            f"Partie {game} : score {result['score']} | {result['ticks']} frames"
+            f" ({result['game_seconds']:.0f} s de jeu) en {result['elapsed']:.2f} s"
+            f" | x{result['speedup']:.0f} temps réel"
+        )
+        if meter is not None:
+            report = meter.report()
+            sustained = report["sustained"]
+            print(
+                f"  Tenu à 60 FPS : {sustained.get('objects', 0)} objets,"
+                f" {sustained.get('slices', 0)} morceaux,"
+                f" {sustained.get('particles', 0)} particules"
+                f" ({'saturé' if report['saturated'] else 'non saturé'}"
+                f" après {report['windows']} s)"
+            )
+
+
+    if soak is not None:
+        soak.sample(session)
+        report = soak.report()
+        print(
+            f"Endurance : {report['games']} parties en {report['elapsed_s'] / 60:.1f} min"
+            f" | meilleur score {report['best_score']}"
+            f" | p99 frame {report['frame_p99_ms']:.2f} ms"
+            f" | mémoire {report['memory_growth_kb']:+} Ko"
+            f" | objets Python {report['gc_objects_growth']:+}"
+        )
+        print("Relevés exportés :", soak.export())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+import json
+import time
+import pygame
+from settings import *
+
+# Étapes d'un appui, dans l'ordre, de l'événement clavier jusqu'à l'image affichée
+STAGES = ["pacing", "dispatch", "resolve", "spawn", "frame", "flip"]
+HIST_BIN_MS = 2
+HIST_MAX_MS = 60
+
+
+class LatencyTracker:
+    """ Latence de bout en bout des appuis qui coupent un objet
+
+    pacing   : attente de l'événement dans la file pendant clock.tick() (exacte si
+               l'événement porte un timestamp SDL, sinon estimée à la moitié de l'attente)
+    dispatch : de la lecture des événements au traitement du KEYDOWN
+    resolve  : recherche de l'objet touché et effets jusqu'à la découpe
+    spawn    : création des morceaux (FruitSlice) et des particules
+    frame    : reste de la frame (simulation, rendu) jusqu'au flip
+    flip     : pygame.display.flip() qui affiche la découpe
+    """
+    def __init__(self):
+        self.samples = []  # Un dictionnaire {étape: ms} par appui
+        self.misses = 0  # Appuis qui n'ont rien coupé
+        self.estimated = 0  # Appuis sans timestamp (pacing estimé)
+        self.enabled = False  # Overlay affiché
+        self.used = False  # Overlay affiché au moins une fois : export en quittant
+        self._press = None
+        self._pending = []
+        self._lines = []
+        self._lines_count = -1
+        self.poll_time = self.poll_ticks = self.tick_seconds = 0
+        self.flip_start = 0.0
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.used = True
+
+    # --- Points de mesure, dans l'ordre de la boucle ---
+    def begin_frame(self, tick_seconds):
+        """Juste après clock.tick() (tick_seconds : temps passé à attendre)"""
+        self.poll_time = time.perf_counter()
+        self.poll_ticks = pygame.time.get_ticks()
+        self.tick_seconds = tick_seconds
+
+    def key_down(self, event):
+        """Avant de traiter un KEYDOWN en jeu"""
+        now = time.perf_counter()
+        timestamp = getattr(event, "timestamp", None)
+        if timestamp:
+            pacing = max(0, self.poll_ticks - timestamp) / 1000
+        else:
+            pacing = self.tick_seconds / 2
+        self._press = {
+            "handle": now,
+            "pacing": pacing,
+            "estimated": not timestamp,
+            "cut_start": None,
+            "cut_end": None,
+        }
+
+    def on_cut(self, start, end):
+        """Appelé par GameSession.cut() (voir cut_listener)"""
+        press = self._press
+        if press is not None:
+            if press["cut_start"] is None:
+                press["cut_start"] = start
+            press["cut_end"] = end
+
+    def key_done(self):
+        """Après GameSession.press_key()"""
+        press, self._press = self._press, None
+        if press is None:
+            return
+        if press["cut_start"] is None:
+            self.misses += 1
+        else:
+            self._pending.append(press)
+
+    def before_flip(self):
+        self.flip_start = time.perf_counter()
+
+    def after_flip(self):
+        """La découpe est à l'écran : on range les appuis de la frame"""
+        if not self._pending:
+            return
+        end = time.perf_counter()
+        for press in self._pending:
+            sample = {
+                "pacing": press["pacing"] * 1000,
+                "dispatch": (press["handle"] - self.poll_time) * 1000,
+                "resolve": (press["cut_start"] - press["handle"]) * 1000,
+                "spawn": (press["cut_end"] - press["cut_start"]) * 1000,
+                "frame": (self.flip_start - press["cut_end"]) * 1000,
+                "flip": (end - self.flip_start) * 1000,
+            }
+            sample["total"] = sum(sample.values())
+            self.samples.append(sample)
+            self.estimated += press["estimated"]
+        self._pending = []
+
+    # --- Résultats ---
+    def stats(self):
+        """Moyenne, p50, p95 et max (ms) de chaque étape et du total"""
+        result = {}
+        for name in STAGES + ["total"]:
+            ordered = sorted(s[name] for s in self.samples)
+            n = len(ordered)
+            if not n:
+                continue
+            result[name] = {
+                "avg": sum(ordered) / n,
+                "p50": ordered[n // 2],
+                "p95": ordered[min(n - 1, int(n * 0.95))],
+                "max": ordered[-1],
+            }
+        return result
+
+    def histogram(self, name="total"):
+        """Nombre d'appuis par tranche de HIST_BIN_MS ms (la dernière regroupe le reste)"""
+        counts = [0] * (HIST_MAX_MS // HIST_BIN_MS)
+        for sample in self.samples:
+            counts[min(len(counts) - 1, int(sample[name] // HIST_BIN_MS))] += 1
+        return counts
+
+    def export(self, path=None):
+        if path is None:
+            path = time.strftime("latency_%Y%m%d_%H%M%S.json")
+        data = {
+            "presses": len(self.samples),
+            "misses": self.misses,
+            "pacing_estimated": self.estimated,
+            "stats": self.stats(),
+            "histograms": {
+                "bin_ms": HIST_BIN_MS,
+                **{name: self.histogram(name) for name in STAGES + ["total"]},
+            },
+            "samples": self.samples,
+        }
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
+        return path
+
+    def draw(self, surf, font):
+        """Overlay en bas à droite : étapes (moyenne / p95) et histogramme du total"""
+        if not self.enabled:
+            return
+        if self._lines_count != len(self.samples):
+            stats = self.stats()
+            self._lines = [
+                font.render(f"latence : {len(self.samples)} appuis", True, YELLOW)
+            ] + [
+                font.render(
+                    f"{name:<9} {stats[name]['avg']:6.2f} | p95 {stats[name]['p95']:6.2f} ms",
+                    True,
+                    YELLOW if name == "total" else WHITE,
+                )
+                for name in STAGES + ["total"] if name in stats
+            ]
+            self._lines_count = len(self.samples)
+        line_h = self._lines[0].get_height()
+        counts = self.histogram()
+        bar_w, bar_h = 6, 40
+        width = max(max(line.get_width() for line in self._lines), len(counts) * bar_w) + 16
+        height = line_h * len(self._lines) + bar_h + 20
+        left, top = WIDTH - width - 10, HEIGHT - height - 10
+        pygame.draw.rect(surf, (0, 0, 0), (left, top, width, height))
+        for i, line in enumerate(self._lines):
+            surf.blit(line, (left + 8, top + 6 + i * line_h))
+        peak = max(counts) or 1
+        base = top + height - 6
+        for i, count in enumerate(counts):
+            h = count * bar_h // peak
+            pygame.draw.rect(surf, GREEN, (left + 8 + i * bar_w, base - h, bar_w - 1, h))
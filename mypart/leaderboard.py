@@ -0,0 +1,272 @@
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+
+
+class LeaderboardStore:
+    """ Tableau des scores chargé une fois en mémoire, sauvegardé en arrière-plan """
+    def __init__(self, path, max_entries=10, save_delay=1.0):
+        self.path = path
+        self.max_entries = max_entries
+        self.save_delay = save_delay  # Délai (s) avant l'écriture, regroupe les modifs
+        self.disk_reads = 0
+        self.disk_writes = 0
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()  # Tenu pendant toute une écriture (voir flush)
+        self._timer = None
+        self.entries = self._read()
+
+    def _read(self):
+        """Lit le fichier JSON (une seule fois, au démarrage)"""
+        if not os.path.exists(self.path):
+            return []
+        self.disk_reads += 1
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except (json.JSONDecodeError, IOError):
+            return []
+
+    def _write(self):
+        """Écriture atomique : fichier temporaire puis renommage
+
+        Les écritures se suivent : la copie des scores est prise une fois le
+        verrou d'écriture obtenu, la dernière écriture a donc toujours les plus récents.
+        """
+        with self._write_lock:
+            with self._lock:
+                snapshot = [dict(entry) for entry in self.entries]
+                self._timer = None
+            folder = os.path.dirname(os.path.abspath(self.path))
+            fd, tmp_path = tempfile.mkstemp(dir=folder, prefix=".leaderboard-", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(snapshot, f, indent=2)
+                os.chmod(tmp_path, 0o644)
+                os.replace(tmp_path, self.path)
+                self.disk_writes += 1
+            except OSError:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
+    def _schedule_save(self):
+        """Programme une sauvegarde (les appels rapprochés n'écrivent qu'une fois)"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.save_delay, self._write)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """Écrit immédiatement les modifications en attente (à appeler en quittant)
+
+        Attend aussi la fin d'une écriture déjà lancée par le timer : le thread
+        est un daemon, il serait coupé à la sortie du programme.
+        """
+        with self._lock:
+            pending = self._timer is not None
+            if pending:
+                self._timer.cancel()
+        if pending:
+            self._write()
+        else:
+            with self._write_lock:
+                pass
+
+    def replace(self, entries):
+        with self._lock:
+            self.entries = list(entries)
+        self._schedule_save()
+
+    def add(self, name, score, mode):
+        """Ajoute le score à un joueur existant ou crée une nouvelle entrée"""
+        with self._lock:
+            for entry in self.entries:
+                if entry["name"] == name and entry["mode"] == mode:
+                    entry["score"] += score
+                    break
+            else:
+                self.entries.append({"name": name, "score": score, "mode": mode})
+            self.entries.sort(key=lambda x: x["score"], reverse=True)
+            del self.entries[self.max_entries:]
+        self._schedule_save()
+        return self.entries
+
+    def rank(self, name, score, mode):
+        """Rang du joueur (1-indexé) ou None si pas dans le top"""
+        for i, entry in enumerate(self.entries):
+            if entry["name"] == name and entry["score"] == score and entry["mode"] == mode:
+                return i + 1
+        return None
+
+    def is_name_taken(self, name):
+        return any(entry["name"] == name for entry in self.entries)
+
+    def stats(self):
+        return {"disk_reads": self.disk_reads, "disk_writes": self.disk_writes}
+
+
+class SQLiteLeaderboardStore:
+    """ Tableau des scores dans une base SQLite (historique illimité, requêtes indexées) """
+    def __init__(self, path, max_entries=10):
+        self.path = path
+        self.max_entries = max_entries  # Taille de la page affichée à l'écran
+        self.disk_reads = 0
+        self.disk_writes = 0
+        self._top = None  # Page du top gardée en mémoire pour l'affichage
+        self.db = sqlite3.connect(path)
+        self.db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS scores (
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                mode TEXT NOT NULL,
+                score INTEGER NOT NULL
+            );
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_scores_name_mode ON scores (name, mode);
+            CREATE INDEX IF NOT EXISTS idx_scores_mode_score ON scores (mode, score);
+            CREATE INDEX IF NOT EXISTS idx_scores_score ON scores (score);
+
+            -- Nombre exact de joueurs par (mode, score), tenu à jour par triggers :
+            -- le rang se calcule sur les scores distincts et non sur toutes les lignes
+            CREATE TABLE IF NOT EXISTS score_counts (
+                mode TEXT NOT NULL,
+                score INTEGER NOT NULL,
+                n INTEGER NOT NULL,
+                PRIMARY KEY (mode, score)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_score_counts_score ON score_counts (score, n);  -- Couvrant : rang global
+            CREATE TRIGGER IF NOT EXISTS scores_count_insert AFTER INSERT ON scores BEGIN
+                INSERT INTO score_counts VALUES (NEW.mode, NEW.score, 1)
+                ON CONFLICT (mode, score) DO UPDATE SET n = n + 1;
+            END;
+            CREATE TRIGGER IF NOT EXISTS scores_count_delete AFTER DELETE ON scores BEGIN
+                UPDATE score_counts SET n = n - 1 WHERE mode = OLD.mode AND score = OLD.score;
+                DELETE FROM score_counts WHERE mode = OLD.mode AND score = OLD.score AND n = 0;
+            END;
+            CREATE TRIGGER IF NOT EXISTS scores_count_update AFTER UPDATE OF score, mode ON scores BEGIN
+                UPDATE score_counts SET n = n - 1 WHERE mode = OLD.mode AND score = OLD.score;
+                DELETE FROM score_counts WHERE mode = OLD.mode AND score = OLD.score AND n = 0;
+                INSERT INTO score_counts VALUES (NEW.mode, NEW.score, 1)
+                ON CONFLICT (mode, score) DO UPDATE SET n = n + 1;
+            END;
+
+            -- Anciennes bases : remplace les tranches de 128 points par les compteurs exacts
+            DROP TRIGGER IF EXISTS scores_bucket_insert;
+            DROP TRIGGER IF EXISTS scores_bucket_delete;
+            DROP TRIGGER IF EXISTS scores_bucket_update;
+            DROP TABLE IF EXISTS score_buckets;
+            INSERT INTO score_counts (mode, score, n)
+                SELECT mode, score, COUNT(*) FROM scores
+                WHERE NOT EXISTS (SELECT 1 FROM score_counts)
+                GROUP BY mode, score;
+            """
+        )
+
+    def __len__(self):
+        return self.db.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+
+    @property
+    def entries(self):
+        """Top du tableau (servi depuis la mémoire tant qu'aucun score ne change)"""
+        if self._top is None:
+            self._top = self.top(self.max_entries)
+        return self._top
+
+    def top(self, limit=10, offset=0, mode=None):
+        """Une page du classement, triée par score décroissant (optionnellement par mode)"""
+        self.disk_reads += 1
+        if mode is None:
+            rows = self.db.execute(
+                "SELECT name, score, mode FROM scores ORDER BY score DESC, id LIMIT ? OFFSET ?",
+                (limit, offset),
+            )
+        else:
+            rows = self.db.execute(
+                "SELECT name, score, mode FROM scores WHERE mode = ? "
+                "ORDER BY score DESC, id LIMIT ? OFFSET ?",
+                (mode, limit, offset),
+            )
+        return [{"name": n, "score": sc, "mode": m} for n, sc, m in rows]
+
+    def add(self, name, score, mode):
+        """Ajoute le score à un joueur existant ou crée une nouvelle entrée"""
+        with self.db:
+            self.db.execute(
+                "INSERT INTO scores (name, mode, score) VALUES (?, ?, ?) "
+                "ON CONFLICT (name, mode) DO UPDATE SET score = score + excluded.score",
+                (name, mode, score),
+            )
+        self.disk_writes += 1
+        self._top = None
+        return self.entries
+
+    def replace(self, entries):
+        with self.db:
+            self.db.execute("DELETE FROM scores")
+            self.db.executemany(
+                "INSERT INTO scores (name, mode, score) VALUES (?, ?, ?) "
+                "ON CONFLICT (name, mode) DO UPDATE SET score = score + excluded.score",
+                [(e["name"], e["mode"], e["score"]) for e in entries],
+            )
+        self.disk_writes += 1
+        self._top = None
+
+    def rank(self, name, score, mode, per_mode=False):
+        """Rang du joueur (1-indexé, ex aequo au même rang) ou None si ce score n'est pas enregistré"""
+        self.disk_reads += 1
+        row = self.db.execute(
+            "SELECT 1 FROM scores WHERE name = ? AND mode = ? AND score = ?",
+            (name, mode, score),
+        ).fetchone()
+        if row is None:
+            return None
+        # Joueurs au-dessus = somme des compteurs des scores plus hauts (parcours d'index)
+        if per_mode:
+            above = self.db.execute(
+                "SELECT COALESCE(SUM(n), 0) FROM score_counts WHERE mode = ? AND score > ?",
+                (mode, score),
+            ).fetchone()[0]
+        else:
+            above = self.db.execute(
+                "SELECT COALESCE(SUM(n), 0) FROM score_counts WHERE score > ?",
+                (score,),
+            ).fetchone()[0]
+        return above + 1
+
+    def is_name_taken(self, name):
+        self.disk_reads += 1
+        return self.db.execute(
+            "SELECT 1 FROM scores WHERE name = ? LIMIT 1", (name,)
+        ).fetchone() is not None
+
+    def migrate(self, json_path=None, score_path=None, legacy_name="ANCIEN RECORD"):
+        """Importe leaderboard.json et fruitscore.txt (seulement si la base est vide)"""
+        if len(self):
+            return 0
+        entries = []
+        if json_path and os.path.exists(json_path):
+            try:
+                with open(json_path, "r") as f:
+                    entries.extend(json.load(f))
+            except (json.JSONDecodeError, IOError):
+                pass
+        if score_path and os.path.exists(score_path):
+            try:
+                with open(score_path, "r") as f:
+                    entries.append({"name": legacy_name, "score": int(f.read().strip()), "mode": "CLASSIC"})
+            except (ValueError, IOError):
+                pass
+        if entries:
+            self.replace(entries)
+        return len(entries)
+
+    def flush(self):
+        """Les écritures SQLite sont déjà validées : ferme simplement la connexion"""
+        self.db.close()
+
+    def stats(self):
+        return {"disk_reads": self.disk_reads, "disk_writes": self.disk_writes}
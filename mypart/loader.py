@@ -0,0 +1,70 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class AssetLoader:
+    """ Chargement des assets en arrière-plan sur un pool de threads
+
+    submit() lance le chargement complet dans un thread : décodage, conversion au
+    format de l'écran (convert/convert_alpha, possible hors du thread principal
+    une fois la fenêtre ouverte) et mise à l'échelle. poll(), appelé à chaque
+    frame par la boucle principale, remet chaque résultat à son callback dans le
+    thread principal, qui remplace les placeholders (et les caches qui en dépendent).
+    Mesure le temps jusqu'à la première image et jusqu'au chargement complet.
+    """
+    def __init__(self, max_workers=4):
+        self.start = time.perf_counter()
+        self.pool = ThreadPoolExecutor(max_workers, thread_name_prefix="assets")
+        self.pending = []  # (nom, future, callback)
+        self.times = {}  # nom -> ms depuis le lancement
+        self.first_frame = None
+        self.fully_loaded = None
+
+    def _elapsed_ms(self):
+        return (time.perf_counter() - self.start) * 1000
+
+    def submit(self, name, load, *args, on_ready=None):
+        """Exécute load(*args) dans un thread, puis on_ready(résultat) au prochain poll()"""
+        self.pending.append((name, self.pool.submit(load, *args), on_ready))
+
+    def poll(self):
+        """Applique les assets prêts ; retourne True si au moins un a été remplacé"""
+        if not self.pending:
+            return False
+        changed = False
+        still_pending = []
+        for name, future, on_ready in self.pending:
+            if not future.done():
+                still_pending.append((name, future, on_ready))
+                continue
+            try:
+                result = future.result()
+            except Exception as e:
+                # Le placeholder reste en place
+                print(f"Asset {name} non chargé : {e}")
+                result = None
+            if on_ready is not None and result is not None:
+                on_ready(result)
+            self.times[name] = self._elapsed_ms()
+            changed = True
+        self.pending = still_pending
+        if not self.pending and self.fully_loaded is None:
+            self.fully_loaded = self._elapsed_ms()
+            self.pool.shutdown(wait=False)
+        return changed
+
+    def frame_shown(self):
+        """À appeler après chaque flip (seul le premier compte)"""
+        if self.first_frame is None:
+            self.first_frame = self._elapsed_ms()
+
+    @property
+    def done(self):
+        return self.fully_loaded is not None
+
+    def report(self):
+        return {
+            "first_frame_ms": self.first_frame,
+            "fully_loaded_ms": self.fully_loaded,
+            "assets_ms": dict(self.times),
+        }
@@ -433,6 +433,7 @@ while running:
         for s in slices:
             s.draw(game_surface)
         for l in lightning_effects:
+            l.update()
             l.draw(game_surface)
         for obj in active_objects:
             obj.draw(game_surface)
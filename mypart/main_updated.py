@@ -1,167 +1,122 @@
 import pygame
-import random
-import json
+import time
 import os
 from settings import *
-from models import GameObject, LightningEffect, Particle, FruitSlice
-from assets import font_small, font_huge, load_game_assets, load_sounds
+from game import GameSession, MAX_GAUGE, TICK_MS
+from models import lightning_pool
+from profiler import CapacityMeter, FrameProfiler, SoakMonitor
+from bot import AutoPlayer
+from latency import LatencyTracker
+from replay import ReplayRecorder
+from dirty import DirtyRectRenderer
+from leaderboard import LeaderboardStore, SQLiteLeaderboardStore
+from loader import AssetLoader
+from music import MusicPlayer
+from assets import (
+    EXTRA_SOUND_FILES, SOUND_FILES, font_small, font_huge, get_font, install_sprites, layer_cache,
+    load_sound, load_sprites, placeholder_sprites, registry, render_text, rotation_cache, text_cache,
+)
 
 # --- Configuration ---
 pygame.init()
-
-# --- Assets (images & sons additionnels) ---
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-IMG_DIR = os.path.join(BASE_DIR, "images")
-
-# On supporte 2 noms de dossier pour les sons (pour éviter les erreurs selon ton projet)
-SOUND_DIRS = [
-    os.path.join(BASE_DIR, "Sounds"),
-    os.path.join(BASE_DIR, "sound"),
-]
-
-def _load_image(filename, size=None, alpha=True):
-    """Charge une image depuis images/. Retourne None si absente."""
-    path = os.path.join(IMG_DIR, filename)
-    try:
-        img = pygame.image.load(path)
-        img = img.convert_alpha() if alpha else img.convert()
-        if size:
-            img = pygame.transform.smoothscale(img, size)
-        return img
-    except Exception:
-        return None
-
-def _load_sound(filename):
-    """Charge un son en cherchant dans SOUND_DIRS. Retourne None si absent."""
-    for d in SOUND_DIRS:
-        path = os.path.join(d, filename)
-        if os.path.exists(path):
-            try:
-                return pygame.mixer.Sound(path)
-            except Exception:
-                return None
-    return None
-
-# Backgrounds / UI (si tu les as dans images/)
-menu_bg = _load_image("menu.png", (WIDTH, HEIGHT), alpha=False)
-fondgame_bg = _load_image("fondgame.png", (WIDTH, HEIGHT), alpha=True)
-
-# Titre: on le redimensionne UNE fois (évite de le re-scaler à chaque frame)
-_title_original = _load_image("title.png", None, alpha=True)
-title_menu = None
-if _title_original:
-    TITLE_MENU_W = 400
-    title_ratio = TITLE_MENU_W / _title_original.get_width()
-    TITLE_MENU_H = int(_title_original.get_height() * title_ratio)
-    title_menu = pygame.transform.smoothscale(_title_original, (TITLE_MENU_W, TITLE_MENU_H))
-
-# SFX/ambiance additionnels (compatibles avec gameplay.py)
-EXTRA_SOUNDS = {
-    "start": "main_start.mp3",
-    "strike": "strike.mp3",
-    "explode": "Explode.mp3",
-    "projection_fruits": "projection_fruits.mp3",
-    "projection_icecube": "projection_iceblock.mp3",
-    "projection_spinner": "projection_spinner.mp3",
-    "projection_bomb": "projection_bomb.wav",
-    "ambiance": "ambiance.mp3",
-    "ambiance_game": "ambiance_game.mp3",
-    "slash_combo": "slash_combo.mp3",
-    "spiner_bonus": "spiner_bonus.mp3",
-    "light_bonus": "lightning.wav",
-    "ice_bonus": "ice_bonus.mp3",
-    "slash_impact": "slash_impact.mp3",
-}
-
-# Images additionnelles (si load_game_assets() ne les charge pas déjà)
-EXTRA_IMAGES = {
-    "apricot": "abricot.png",
-    "pineapple": "ananas.png",
-    "banana": "banane.png",
-    "bomb": "bombe.png",
-    "cherry": "cerise.png",
-    "lemon": "citron.png",
-    "strawberry": "fraise.png",
-    "raspberry": "framboise.png",
-    "dragon_fruit": "fruit_du_dragon.png",
-    "ice_block": "glaçon.png",
-    "kiwi": "kiwi.png",
-    "mango": "mangue.png",
-    "melon": "melon.png",
-    "blueberry": "myrtille.png",
-    "coconut": "noix_de_coco.png",
-    "orange": "orange.png",
-    "watermelon": "pasteque.png",
-    "peach": "peche.png",
-    "pear": "poire.png",
-    "apple": "pomme.png",
-    "grape": "raisin.png",
-    "shuriken": "shuriken.png",
-    "lightning": "eclair.png",
-}
-
-sounds = load_sounds()
-
-# On complète le dict de sons avec ceux de gameplay.py (sans casser si un fichier manque)
-for key, fname in EXTRA_SOUNDS.items():
-    if key not in sounds:
-        sounds[key] = _load_sound(fname)
-
-# Channels dédiés pour les ambiances (optionnel)
-ambiance_channel = pygame.mixer.Channel(0)
-ambiancegame_channel = pygame.mixer.Channel(1)
-
-def _play_menu_ambiance():
-    if sounds.get("ambiance"):
-        ambiancegame_channel.stop()
-        if not ambiance_channel.get_busy():
-            ambiance_channel.play(sounds["ambiance"], loops=-1)
-
-def _play_game_ambiance():
-    if sounds.get("ambiance_game"):
-        ambiance_channel.stop()
-        if not ambiancegame_channel.get_busy():
-            ambiancegame_channel.play(sounds["ambiance_game"], loops=-1)
-
-# Lance l'ambiance menu au démarrage si disponible
-_play_menu_ambiance()
+pygame.mixer.init()
+# Images et sons sont décodés en arrière-plan : le menu s'affiche tout de suite
+# avec des placeholders, remplacés au fur et à mesure (voir loader.py)
+loader = AssetLoader()
 screen = pygame.display.set_mode((WIDTH, HEIGHT))
 game_surface = pygame.Surface((WIDTH, HEIGHT))
 pygame.display.set_caption("Fruit Slicer Game")
 clock = pygame.time.Clock()
 
-image_data = load_game_assets()
+# --- Assets (un seul manifeste pour images et sons, voir assets.py et registry.py) ---
+# Backgrounds / UI (si tu les as dans images/), None tant qu'ils ne sont pas chargés
+menu_bg = None
+fondgame_bg = None
+title_menu = None
 
-# On complète les sprites (si certains fruits/bonus ne sont pas déjà dans image_data)
-for name, filename in EXTRA_IMAGES.items():
-    if name in image_data:
-        continue
-    img = _load_image(filename, (60, 60), alpha=True)
-    if img:
-        image_data[name] = img
-    else:
-        # Fallback visuel si l'image est manquante
-        surf = pygame.Surface((60, 60), pygame.SRCALPHA)
-        color = ICE_BLUE if name == "ice_block" else (ELECTRIC_ORANGE if name == "lightning" else GREEN)
-        pygame.draw.circle(surf, color, (30, 30), 25)
-        image_data[name] = surf
+def _menu_bg_ready(img):
+    global menu_bg
+    menu_bg = img
+
+def _fondgame_bg_ready(img):
+    global fondgame_bg
+    fondgame_bg = img
+
+def _title_ready(img):
+    global title_menu
+    title_menu = img
 
-# --- Leaderboard (fichier JSON persistant) ---
+loader.submit("ui:menu", registry.acquire, "ui:menu", on_ready=_menu_bg_ready)
+loader.submit("ui:game", registry.acquire, "ui:game", on_ready=_fondgame_bg_ready)
+loader.submit("ui:title", registry.acquire, "ui:title", on_ready=_title_ready)
+
+# Sons : None (silence) jusqu'à ce que le thread de chargement les ait décodés
+# (SFX/ambiance de gameplay.py compris, sans casser si un fichier manque)
+sounds = {name: None for name in {**SOUND_FILES, **EXTRA_SOUND_FILES}}
+
+# Ambiances MENU / PLAY lues en streaming, avec fondu au changement d'écran
+music = MusicPlayer({"MENU": registry.resolve("music:menu"), "PLAY": registry.resolve("music:play")})
+music.play("MENU")
+
+def _sound_ready(name):
+    def ready(sound):
+        sounds[name] = sound
+        # Son du lancement : joué à son arrivée si on est encore au menu
+        if name == "start" and game_state == "MENU":
+            sound.play()
+    return ready
+
+for name in sounds:
+    loader.submit(f"sound:{name}", load_sound, name, on_ready=_sound_ready(name))
+
+# Sprites : placeholders (ronds de couleur) jusqu'à l'arrivée de l'atlas ou des PNG
+image_data = placeholder_sprites()
+rotation_cache.fit(image_data)
+loader.submit("sprites", load_sprites, on_ready=lambda sprites: install_sprites(image_data, sprites))
+
+# --- Leaderboard (fichier JSON persistant, ou base SQLite pour un historique illimité) ---
+LEADERBOARD_BACKEND = "json"  # "json" ou "sqlite"
 LEADERBOARD_FILE = "leaderboard.json"
+LEADERBOARD_DB = "leaderboard.db"
+LEGACY_SCORE_FILE = "fruitscore.txt"
 MAX_LEADERBOARD_ENTRIES = 10
 
 
 # --- Variables Globales ---
 game_state = "MENU"
-sub_mode, score, lives = "CLASSIC", 0, 3
-active_objects, slices, particles, slashes, lightning_effects = [], [], [], [], []
-_play_game_ambiance()
-if sounds.get("start"):
-    sounds["start"].play()
-speed_multiplier, shake_intensity, flash_timer = 1.0, 0, 0
-challenge_timer, is_iced, ice_timer = 3600, False, 0
-is_overcharged, overcharge_timer, special_gauge = False, 0, 0
-MAX_GAUGE = 100
+
+
+def _play_sound(name):
+    if sounds.get(name):
+        sounds[name].play()
+
+
+# Mesure du temps par phase (F3 : afficher/masquer, F4 : exporter en JSON)
+profiler = FrameProfiler()
+font_profiler = get_font(16)
+
+# Toute la logique de la partie (spawn, touches, timers) vit dans GameSession
+PHYSICS_BACKEND = "numpy"  # "python" (un objet à la fois) ou "numpy" (vectorisé)
+session = GameSession(image_data, _play_sound, profiler, PHYSICS_BACKEND)
+# Mode Tempête : nombre maximum d'entités tenu à 60 FPS sur cette machine
+storm_meter = CapacityMeter()
+
+# Replays : chaque partie jouée est enregistrée (graine + touches) dans REPLAY_DIR
+# (pas celles lancées par le bot, sinon un test d'endurance remplirait le dossier)
+RECORD_REPLAYS = True
+REPLAY_DIR = "replays"
+recorder = None
+replays_saved = 0  # Numéro dans le nom du fichier : deux parties dans la même seconde ne s'écrasent pas
+
+# Joueur automatique (F5) : les parties s'enchaînent et SoakMonitor relève
+# temps de frame, score et mémoire (exportés dans soak_*.json en quittant)
+autoplayer = AutoPlayer(reaction_ms=250, accuracy=0.95, keys_per_second=8)
+autoplay = False
+soak = None
+
+# Latence des appuis, de l'événement clavier au flip (F6 : overlay, export en quittant)
+latency = LatencyTracker()
+session.cut_listener = latency.on_cut
 
 # --- Variables pour l'écran USERNAME ---
 current_username = ""  # Nom en cours de saisie
@@ -170,106 +125,129 @@ pending_mode = "CLASSIC"  # Le mode à lancer après la saisie du nom
 username_input_active = True  # Pour gérer le focus de l'input
 username_error = ""  # Message d'erreur affiché sur l'écran USERNAME
 
-SPAWN_EVENT = pygame.USEREVENT + 1
-pygame.time.set_timer(SPAWN_EVENT, 900)
 
+# Le fichier n'est lu qu'une fois : toutes les requêtes sont servies depuis la mémoire
+if LEADERBOARD_BACKEND == "sqlite":
+    leaderboard_store = SQLiteLeaderboardStore(LEADERBOARD_DB, MAX_LEADERBOARD_ENTRIES)
+    # Première ouverture : on reprend les scores de l'ancien format
+    leaderboard_store.migrate(LEADERBOARD_FILE, LEGACY_SCORE_FILE)
+else:
+    leaderboard_store = LeaderboardStore(LEADERBOARD_FILE, MAX_LEADERBOARD_ENTRIES)
 
-# Chargement du leaderboard depuis le fichier JSON
+
+# Chargement du leaderboard (depuis la mémoire)
 def load_leaderboard():
-    """Charge le tableau des scores depuis le fichier JSON"""
-    if os.path.exists(LEADERBOARD_FILE):
-        try:
-            with open(LEADERBOARD_FILE, "r") as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
-            return []
-    return []
+    """Retourne le tableau des scores (sans accès disque)"""
+    return leaderboard_store.entries
 
 
-# Sauvegarde du leaderboard dans le fichier JSON
+# Sauvegarde du leaderboard (écriture différée en arrière-plan)
 def save_leaderboard(leaderboard):
-    """Sauvegarde le tableau des scores dans le fichier JSON"""
-    with open(LEADERBOARD_FILE, "w") as f:
-        json.dump(leaderboard, f, indent=2)
+    """Remplace le tableau des scores et programme la sauvegarde du fichier JSON"""
+    leaderboard_store.replace(leaderboard)
 
 
 # Ajout ou mise à jour d'une entrée dans le leaderboard
 def add_to_leaderboard(name, score, mode):
     """Ajoute le score à un joueur existant ou crée une nouvelle entrée"""
-    leaderboard = load_leaderboard()
-
-    # Chercher si le joueur existe déjà pour ce mode
-    player_found = False
-    for entry in leaderboard:
-        if entry["name"] == name and entry["mode"] == mode:
-            entry["score"] += score  # On ajoute les points au total existant
-            player_found = True
-            break
-
-    if not player_found:
-        # Si c'est un nouveau joueur ou nouveau mode pour ce joueur
-        leaderboard.append({"name": name, "score": score, "mode": mode})
-
-    # Tri par score total décroissant
-    leaderboard.sort(key=lambda x: x["score"], reverse=True)
-    leaderboard = leaderboard[:MAX_LEADERBOARD_ENTRIES]
-    save_leaderboard(leaderboard)
-    return leaderboard
+    return leaderboard_store.add(name, score, mode)
 
 
 # Obtenir le rang d'un joueur dans le leaderboard
 def get_player_rank(name, score, mode):
     """Retourne le rang du joueur (1-indexé) ou None si pas dans le top"""
-    leaderboard = load_leaderboard()
-    for i, entry in enumerate(leaderboard):
-        if entry["name"] == name and entry["score"] == score and entry["mode"] == mode:
-            return i + 1
-    return None
+    return leaderboard_store.rank(name, score, mode)
 
 
 # Vérifie si un nom est déjà pris dans le leaderboard
 def is_name_taken(name):
     """Vérifie si le nom existe déjà dans le leaderboard"""
-    leaderboard = load_leaderboard()
-    return any(entry["name"] == name for entry in leaderboard)
-
-
-# Fonction pour couper tous les objets non-bombes à l'écran
-def trigger_area_cut(particle_color=WHITE):
-    """Coupe tous les objets non-bombes à l'écran"""
-    global score
-    targets = [obj for obj in active_objects if obj.type != "bomb"]
-    count = len(targets)
-    for obj in active_objects[:]:
-        if obj.type != "bomb":
-            # Calcul du score bonus
-            if particle_color == GOLD and count > 1:
-                score += count - 1
-            else:
-                score += count
-
-            slices.extend(
-                [
-                    FruitSlice(obj.image_orig, obj.x, obj.y, "left"),
-                    FruitSlice(obj.image_orig, obj.x, obj.y, "right"),
-                ]
-            )
-            for _ in range(3):
-                particles.append(Particle(obj.x + 30, obj.y + 30, particle_color))
-            active_objects.remove(obj)
+    return leaderboard_store.is_name_taken(name)
 
 
 # Réinitialisation de la partie
 def reset_game(mode):
     """Réinitialise la partie"""
-    global game_state, sub_mode, score, lives, speed_multiplier, challenge_timer
-    global active_objects, slices, particles, slashes, flash_timer
-    global is_overcharged, overcharge_timer, special_gauge, lightning_effects, is_iced
-    game_state, sub_mode = "PLAY", mode
-    score, lives, speed_multiplier, challenge_timer, flash_timer = 0, 3, 1.0, 3600, 0
-    is_iced = is_overcharged = False
-    overcharge_timer = special_gauge = 0
-    active_objects, slices, particles, slashes, lightning_effects = [], [], [], [], []
+    global game_state, accumulator, recorder
+    game_state = "PLAY"
+    accumulator = 0.0
+    music.play("PLAY")
+    session.reset(mode)
+    storm_meter.reset()
+    autoplayer.reset()
+    recorder = ReplayRecorder(session.seed, mode) if RECORD_REPLAYS and not autoplay else None
+
+
+def press_key(key_name):
+    """Appui en jeu (joueur ou bot), enregistré dans le replay"""
+    if recorder:
+        recorder.key(session.ticks, key_name)
+    session.press_key(key_name)
+
+
+def save_replay():
+    """Sauvegarde le replay de la partie qui vient de se terminer"""
+    global replays_saved
+    if recorder is None:
+        return
+    replays_saved += 1
+    name = time.strftime("replay_%Y%m%d_%H%M%S") + f"_{replays_saved:03d}_{session.ticks}t.fsr"
+    try:
+        recorder.save(os.path.join(REPLAY_DIR, name), session.ticks, session.score)
+    except OSError as e:
+        print(f"Replay non sauvegardé : {e}")
+
+
+def restart_game(mode):
+    """Relance le même mode (le mode Tempête ne passe pas par la saisie du nom)"""
+    if mode == "STORM":
+        reset_game(mode)
+    else:
+        go_to_username_screen(mode)
+
+
+# Écrans statiques : seules les zones des widgets modifiés sont redessinées
+STATIC_SCREENS = ["MENU", "USERNAME", "GAMEOVER", "LEADERBOARD"]
+dirty = DirtyRectRenderer((WIDTH, HEIGHT))
+
+
+def _button(rect, mouse_pos):
+    """Widget bouton : la zone (avec la bordure) et son état de survol"""
+    return rect.inflate(4, 4), rect.collidepoint(mouse_pos)
+
+
+def static_widgets(mouse_pos):
+    """Widgets de l'écran statique courant : {nom: (zone, état)}"""
+    if game_state == "MENU":
+        return {
+            "classic": _button(pygame.Rect(WIDTH // 2 - 150, 280, 300, 60), mouse_pos),
+            "challenge": _button(pygame.Rect(WIDTH // 2 - 150, 370, 300, 60), mouse_pos),
+            "leaderboard": _button(pygame.Rect(WIDTH // 2 - 150, 440, 300, 30), mouse_pos),
+            "storm": _button(pygame.Rect(WIDTH // 2 - 150, 575, 300, 22), mouse_pos),
+        }
+    if game_state == "USERNAME":
+        cursor_visible = (pygame.time.get_ticks() // 500) % 2 == 0
+        can_validate = len(current_username.strip()) > 0
+        valider_rect = pygame.Rect(WIDTH // 2 - 100, 430, 200, 55)
+        return {
+            "input": (pygame.Rect(0, 255, WIDTH, 70), (current_username, cursor_visible)),
+            "error": (pygame.Rect(0, 395, WIDTH, 30), username_error),
+            "valider": (valider_rect.inflate(4, 4), (can_validate, valider_rect.collidepoint(mouse_pos))),
+        }
+    if game_state == "GAMEOVER":
+        return {
+            f"button{i}": _button(pygame.Rect(WIDTH // 2 - 150, y, 300, 60), mouse_pos)
+            for i, y in enumerate([280, 370, 460])
+        }
+    # LEADERBOARD
+    return {
+        "table": (
+            pygame.Rect(0, 80, WIDTH, HEIGHT - 230),
+            tuple((e["name"], e["score"], e["mode"]) for e in load_leaderboard()),
+        ),
+        "restart": _button(pygame.Rect(WIDTH // 2 - 310, HEIGHT - 140, 300, 50), mouse_pos),
+        "menu": _button(pygame.Rect(WIDTH // 2 + 10, HEIGHT - 140, 300, 50), mouse_pos),
+    }
 
 
 # Transition vers l'écran de saisie du nom
@@ -284,28 +262,58 @@ def go_to_username_screen(mode):
     pygame.key.start_text_input()
 
 
-# Dans main.py avant la boucle
-# (Si tu veux une musique globale en plus des canaux d'ambiance, décommente ci-dessous)
-# try:
-#     pygame.mixer.music.load(os.path.join(BASE_DIR, "sound", "mainsong.mp3"))
-#     pygame.mixer.music.set_volume(0.5)
-#     pygame.mixer.music.play(-1)  # -1 pour jouer en boucle
-# except Exception:
-#     pass
-
 # --- Boucle de Jeu ---
+# La simulation avance par pas fixes de TICK_MS, indépendamment du nombre d'images
+# affichées : une machine lente saccade mais la durée des timers ne change pas.
+accumulator = 0.0
+load_reported = False
 running = True
 while running:
+    profiler.begin("clock")
+    tick_start = time.perf_counter()
+    frame_ms = clock.tick(60)
+    latency.begin_frame(time.perf_counter() - tick_start)
+    profiler.end("clock")
     mouse_pos = pygame.mouse.get_pos()
-    if game_state == "MENU" and menu_bg:
-        screen.blit(menu_bg, (0, 0))
-    else:
-        screen.fill(DARK_BLUE)
 
+    profiler.begin("events")
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
             running = False
 
+        # --- Outils de mesure ---
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+            profiler.toggle()
+            continue
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F6:
+            latency.toggle()
+            continue
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F5:
+            autoplay = not autoplay
+            if autoplay and soak is None:
+                soak = SoakMonitor()
+            continue
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+            caches = {
+                "text": text_cache.stats(),
+                "rotation": rotation_cache.stats(),
+                "layers": layer_cache.stats(),
+                "dirty": dirty.stats(),
+                "render_queue": session.render_queue.stats(),
+                "latency": latency.stats(),
+                "loading": loader.report(),
+                "assets": registry.report(),
+                "music": music.report(),
+                "leaderboard": leaderboard_store.stats(),
+                "pools": {
+                    "objects": session.object_pool.stats(),
+                    "slices": session.slice_pool.stats(),
+                    "lightning": lightning_pool.stats(),
+                },
+            }
+            print("Profil exporté :", profiler.export(extra=caches))
+            continue
+
         # --- Gestion de la saisie de texte pour USERNAME ---
         if game_state == "USERNAME":
             if event.type == pygame.TEXTINPUT:
@@ -315,6 +323,23 @@ while running:
                     current_username += filtered
                     username_error = ""  # Effacer l'erreur dès que le texte change
 
+            # Click sur le bouton Valider avec la souris
+            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                if (
+                    pygame.Rect(WIDTH // 2 - 100, 430, 200, 55).collidepoint(mouse_pos)
+                    and current_username.strip()
+                ):
+                    if (
+                        is_name_taken(current_username.strip())
+                        and current_username.strip() != saved_username
+                    ):
+                        username_error = "Ce nom est déjà utilisé !"
+                    else:
+                        username_error = ""
+                        saved_username = current_username.strip()
+                        pygame.key.stop_text_input()
+                        reset_game(pending_mode)
+
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_BACKSPACE:
                     current_username = current_username[:-1]
@@ -330,7 +355,7 @@ while running:
                     # Annuler et retour au menu
                     pygame.key.stop_text_input()
                     game_state = "MENU"
-                    _play_menu_ambiance()
+                    music.play("MENU")
             continue  # On ne traite pas les autres événements sur cet écran
 
         # --- Gestion des clics et touches selon l'état du jeu ---
@@ -341,14 +366,22 @@ while running:
                         go_to_username_screen("CLASSIC")
                     elif 370 < mouse_pos[1] < 430:
                         go_to_username_screen("CHALLENGE")
+                    # Bouton vers le leaderboard
+                    elif 440 < mouse_pos[1] < 470:
+                        game_state = "LEADERBOARD"
+                    # Mode Tempête (test de capacité)
+                    elif 575 < mouse_pos[1] < 597:
+                        reset_game("STORM")
             elif game_state == "PAUSE":
                 if pygame.Rect(WIDTH // 2 - 150, 300, 300, 60).collidepoint(mouse_pos):
                     game_state = "PLAY"
+                    if recorder:
+                        recorder.resume(session.ticks)
                 elif pygame.Rect(WIDTH // 2 - 150, 380, 300, 60).collidepoint(
                     mouse_pos
                 ):
                     game_state = "MENU"
-                    _play_menu_ambiance()
+                    music.play("MENU")
             elif game_state == "GAMEOVER":
                 # Bouton : voir le tableau des scores
                 if pygame.Rect(WIDTH // 2 - 150, 280, 300, 60).collidepoint(mouse_pos):
@@ -357,333 +390,185 @@ while running:
                 elif pygame.Rect(WIDTH // 2 - 150, 370, 300, 60).collidepoint(
                     mouse_pos
                 ):
-                    go_to_username_screen(sub_mode)
+                    restart_game(session.sub_mode)
                 # Bouton : retour au menu
                 elif pygame.Rect(WIDTH // 2 - 150, 460, 300, 60).collidepoint(
                     mouse_pos
                 ):
                     game_state = "MENU"
-                    _play_menu_ambiance()
+                    music.play("MENU")
             elif game_state == "LEADERBOARD":
                 # Bouton : recommencer depuis le leaderboard
                 if pygame.Rect(WIDTH // 2 - 310, HEIGHT - 140, 300, 50).collidepoint(
                     mouse_pos
                 ):
-                    go_to_username_screen(sub_mode)
+                    restart_game(session.sub_mode)
                 # Bouton : retour au menu depuis le leaderboard
                 elif pygame.Rect(WIDTH // 2 + 10, HEIGHT - 140, 300, 50).collidepoint(
                     mouse_pos
                 ):
                     game_state = "MENU"
-                    _play_menu_ambiance()
+                    music.play("MENU")
 
         # --- Gestion des touches clavier en mode PLAY ---
         if event.type == pygame.KEYDOWN:
             if game_state == "PLAY":
-                if combo_timer > 0:
-                    combo_timer -= 1
                 if event.key == pygame.K_ESCAPE:
                     game_state = "PAUSE"
+                    if recorder:
+                        recorder.pause(session.ticks)
                 else:
-                    key_pressed = pygame.key.name(event.key).lower()
-                    BONUS_KEYS = ["a", "w", "s", "d"]
-                    FRUIT_KEYS = ["j", "k", "l"]
-
-                    # Capacité spéciale "Grand Slash"
-                    if (
-                        event.key == pygame.K_SPACE
-                        and is_overcharged
-                        and special_gauge >= MAX_GAUGE
-                    ):
-                        slashes.append(
-                            {
-                                "start": (0, HEIGHT // 2),
-                                "end": (WIDTH, HEIGHT // 2),
-                                "life": 255,
-                            }
-                        )
-                        trigger_area_cut(ELECTRIC_ORANGE)
-                        if sounds["slash"]:
-                            sounds["slash"].play()
-                        special_gauge = 0
-                        shake_intensity = 25
-
-                    # Détection de collision (touche clavier)
-                    for obj in active_objects[:]:
-                        hit = False
-                        if is_overcharged:
-                            hit = key_pressed == obj.letter
-                        elif obj.is_bonus and key_pressed in BONUS_KEYS:
-                            hit = key_pressed == obj.letter
-                        elif not obj.is_bonus and key_pressed in FRUIT_KEYS:
-                            hit = key_pressed == obj.letter
-
-                        if hit:
-                            obj.hp -= 1
-                            if obj.hp <= 0:
-                                if obj.type == "bomb":
-                                    if sounds["bomb"]:
-                                        sounds["bomb"].play()
-                                    lives = 0
-                                    shake_intensity = 50
-                                    # Enregistrer le score avant GAMEOVER
-                                    add_to_leaderboard(saved_username, score, sub_mode)
-                                    game_state = "GAMEOVER"
-                                elif obj.is_enrobed:
-                                    if sounds["halo"]:
-                                        sounds["halo"].play()
-                                    score += 1
-                                    flash_timer, shake_intensity = 10, 25
-                                    trigger_area_cut(GOLD)
-                                elif obj.type == "lightning":
-                                    if sounds["lightning"]:
-                                        sounds["lightning"].play()
-                                    score += 1
-                                    is_overcharged, overcharge_timer = True, 300
-                                elif obj.type == "shuriken":
-                                    if sounds["slash"]:
-                                        sounds["slash"].play()
-                                    score += 1
-                                    slashes.append(
-                                        {
-                                            "start": (0, obj.y + 30),
-                                            "end": (WIDTH, obj.y + 30),
-                                            "life": 255,
-                                        }
-                                    )
-                                    trigger_area_cut(WHITE)
-                                elif obj.type == "ice_block":
-                                    if sounds["ice"]:
-                                        sounds["ice"].play()
-                                    score += 1
-                                    is_iced, ice_timer = True, 300
-                                else:
-                                    # Fruit classique + Combo
-                                    if sounds["fruit_cut"]:
-                                        sounds["fruit_cut"].play()
-                                    if combo_timer > 0:
-                                        score += 2
-                                        combo_count += 1
-                                    else:
-                                        score += 1
-                                        combo_count = 1
-                                    combo_timer = COMBO_THRESHOLD
-                                    if is_overcharged:
-                                        special_gauge = min(
-                                            MAX_GAUGE, special_gauge + 10
-                                        )
-
-                                    slices.extend(
-                                        [
-                                            FruitSlice(
-                                                obj.image_orig, obj.x, obj.y, "left"
-                                            ),
-                                            FruitSlice(
-                                                obj.image_orig, obj.x, obj.y, "right"
-                                            ),
-                                        ]
-                                    )
-                                    for _ in range(4):
-                                        particles.append(
-                                            Particle(obj.x + 30, obj.y + 30)
-                                        )
-
-                                if obj in active_objects:
-                                    active_objects.remove(obj)
-                            break
-
-        # --- Gestion du spawn des objets ---
-        if event.type == SPAWN_EVENT and game_state == "PLAY":
-            if not is_iced:
-                spawn_count = min(4, 1 + (score // 1000))
-                if is_overcharged:
-                    spawn_count = 6
-                for _ in range(spawn_count):
-                    active_objects.append(
-                        GameObject(image_data, is_overcharged, speed_multiplier)
-                    )
+                    latency.key_down(event)
+                    press_key(pygame.key.name(event.key).lower())
+                    latency.key_done()
+    profiler.end("events")
+
+    # Assets arrivés depuis la dernière frame : les placeholders sont remplacés
+    if loader.poll():
+        dirty.invalidate()
+    music.update()
+
+    # Écrans statiques : on ne redessine que si un widget a changé d'état
+    # (les overlays de mesure changent à chaque frame : dans ce cas on redessine tout)
+    dirty_rects = None
+    if game_state in STATIC_SCREENS and not profiler.enabled and not latency.enabled:
+        dirty_rects = dirty.update(game_state, static_widgets(mouse_pos))
+    else:
+        dirty.invalidate()
 
-            # Accélération du jeu
-            base_delay = max(400, 900 - (score // 10))
-            pygame.time.set_timer(SPAWN_EVENT, 300 if is_overcharged else base_delay)
+    if dirty_rects != []:
+        if game_state == "MENU" and menu_bg:
+            screen.blit(menu_bg, (0, 0))
+        else:
+            screen.fill(DARK_BLUE)
 
     # --- Logique de mise à jour ---
     if game_state in ["PLAY", "PAUSE"]:
         if game_state == "PLAY":
-            # 1. Gestion des timers (Bonus et Challenge)
-            if is_iced:
-                ice_timer -= 1
-                is_iced = ice_timer > 0
-            else:
-                # On ne baisse le chrono Challenge QUE si le gel est inactif
-                if sub_mode == "CHALLENGE":
-                    challenge_timer -= 1
-                    if challenge_timer <= 0:
-                        # Temps écoulé en Challenge : enregistrer le score
-                        add_to_leaderboard(saved_username, score, sub_mode)
-                        game_state = "GAMEOVER"
-
-            if is_overcharged:
-                overcharge_timer -= 1
-                if overcharge_timer <= 0:
-                    is_overcharged = False
-                    slashes.append(
-                        {
-                            "start": (0, HEIGHT // 2),
-                            "end": (WIDTH, HEIGHT // 2),
-                            "life": 255,
-                        }
-                    )
-                    trigger_area_cut(ELECTRIC_ORANGE)
-                    if sounds["slash"]:
-                        sounds["slash"].play()
-                    shake_intensity = 25
-                elif random.random() < 0.2:
-                    lightning_effects.append(LightningEffect())
-
-            # 2. Animations (Particules et morceaux de fruits)
-            for p in particles[:]:
-                p.update()
-                if p.life <= 0:
-                    particles.remove(p)
-
-            for s in slices[:]:
-                s.update()
-                if s.y > HEIGHT + 100:
-                    slices.remove(s)
-
-            # 3. Mouvement des objets principaux (Fruits non coupés)
-            for obj in active_objects[:]:
-                obj.move(is_slowed=is_iced)
-
-                if obj.y > HEIGHT + 100:
-                    if not is_iced and not is_overcharged:
-                        if (
-                            obj.type not in ["bomb", "ice_block", "lightning"]
-                            and sub_mode == "CLASSIC"
-                        ):
-                            lives -= 1
-                    active_objects.remove(obj)
-
-            # 4. Traits de coupe
-            for sl in slashes[:]:
-                sl["life"] -= 50
-                if sl["life"] <= 0:
-                    slashes.remove(sl)
-
-        # --- Rendu Visuel ---
+            accumulator += min(frame_ms, MAX_FRAME_MS)
+            while accumulator >= TICK_MS:
+                if autoplay:
+                    for key_name in autoplayer.keys(session):
+                        press_key(key_name)
+                session.tick()
+                accumulator -= TICK_MS
+            if autoplay:
+                soak.frame(frame_ms, session)
+            if session.sub_mode == "STORM":
+                storm_meter.add(frame_ms, session.entity_counts())
+                if storm_meter.failed:
+                    session.end_game()
+
+        # --- Rendu Visuel (interpolé entre les deux derniers pas) ---
+        profiler.begin("render")
         if fondgame_bg:
             game_surface.blit(fondgame_bg, (0, 0))
         else:
             game_surface.fill(DARK_BLUE)
-        for p in particles:
-            p.draw(game_surface)
-        for s in slices:
-            s.draw(game_surface)
-        for l in lightning_effects:
-            l.draw(game_surface)
-        for obj in active_objects:
-            obj.draw(game_surface)
-        for sl in slashes:
-            pygame.draw.line(game_surface, WHITE, sl["start"], sl["end"], 15)
+        session.draw(game_surface, accumulator / TICK_MS)
 
         # Tremblement d'écran
-        offset = (
-            [
-                random.randint(-shake_intensity, shake_intensity),
-                random.randint(-shake_intensity, shake_intensity),
-            ]
-            if shake_intensity > 0
-            else [0, 0]
-        )
-        if game_state == "PLAY":
-            shake_intensity = max(0, shake_intensity - 1)
-        screen.blit(game_surface, offset)
+        screen.blit(game_surface, session.shake_offset())
+        profiler.end("render")
 
         # Overlays Surcharge / Glaçon
-        if is_overcharged:
-            ov = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-            ov.fill((255, 165, 0, 40))
-            screen.blit(ov, (0, 0))
+        profiler.begin("overlays")
+        if session.is_overcharged:
+            screen.blit(layer_cache.tint((WIDTH, HEIGHT), (255, 165, 0, 40)), (0, 0))
             pygame.draw.rect(screen, (50, 50, 50), (WIDTH - 370, 20, 200, 20))
-            bar_col = ELECTRIC_ORANGE if special_gauge >= MAX_GAUGE else WHITE
+            bar_col = ELECTRIC_ORANGE if session.special_gauge >= MAX_GAUGE else WHITE
             pygame.draw.rect(
                 screen,
                 bar_col,
-                (WIDTH - 370, 20, (special_gauge / MAX_GAUGE) * 200, 20),
+                (WIDTH - 370, 20, (session.special_gauge / MAX_GAUGE) * 200, 20),
             )
             screen.blit(
-                font_small.render("GRAND SLASH (ESPACE)", True, bar_col),
+                render_text(font_small, "GRAND SLASH (ESPACE)", True, bar_col),
                 (WIDTH - 370, 45),
             )
 
-        if is_iced:
-            ice_ov = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-            ice_ov.fill((100, 200, 255, 60))
-            screen.blit(ice_ov, (0, 0))
+        if session.is_iced:
+            screen.blit(layer_cache.tint((WIDTH, HEIGHT), (100, 200, 255, 60)), (0, 0))
+        profiler.end("overlays")
 
         # Affichage du Score et des Vies (Interface)
-        score_text = f"SCORE: {score}"
-        if combo_timer > 0 and combo_count > 1:
-            score_text += f" | COMBO X2 ({combo_count}) !"
+        profiler.begin("hud")
+        score_text = f"SCORE: {session.score}"
+        if session.combo_timer > 0 and session.combo_count > 1:
+            score_text += f" | COMBO X2 ({session.combo_count}) !"
+        if autoplay:
+            score_text += " | BOT"
         hud_text = (
             score_text
             + " | "
             + (
-                f"VIES: {lives}"
-                if sub_mode == "CLASSIC"
-                else f"TEMPS: {challenge_timer // 60}s"
+                f"VIES: {session.lives}"
+                if session.sub_mode == "CLASSIC"
+                else f"TEMPS: {session.challenge_timer // TICK_RATE}s"
+                if session.sub_mode == "CHALLENGE"
+                else f"OBJETS: {len(session.active_objects)}"
             )
         )
         # Afficher le nom du joueur en haut à droite
-        name_text = font_small.render(
-            f"Joueur: {saved_username}", True, (180, 180, 255)
+        name_text = render_text(
+            font_small, f"Joueur: {saved_username}", True, (180, 180, 255)
         )
         screen.blit(name_text, (WIDTH - name_text.get_width() - 20, 20))
 
         screen.blit(
-            font_small.render(
-                hud_text, True, (255, 215, 0) if combo_timer > 0 else WHITE
+            render_text(
+                font_small, hud_text, True, (255, 215, 0) if session.combo_timer > 0 else WHITE
             ),
             (20, 20),
         )
+        profiler.end("hud")
 
         # Flash à l'écran lors d'un cut spécial
         if game_state == "PAUSE":
-            overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 180))
-            screen.blit(overlay, (0, 0))
-            txt = font_huge.render("PAUSE", True, YELLOW)
+            profiler.begin("overlays")
+            screen.blit(layer_cache.tint((WIDTH, HEIGHT), (0, 0, 0, 180)), (0, 0))
+            txt = render_text(font_huge, "PAUSE", True, YELLOW)
             screen.blit(txt, txt.get_rect(center=(WIDTH // 2, 200)))
             for i, label in enumerate(["REPRENDRE", "MENU"]):
                 rect = pygame.Rect(WIDTH // 2 - 150, 300 + i * 80, 300, 60)
                 col = YELLOW if rect.collidepoint(mouse_pos) else WHITE
                 pygame.draw.rect(screen, col, rect, 2, border_radius=10)
-                btn = font_small.render(label, True, col)
+                btn = render_text(font_small, label, True, col)
                 screen.blit(btn, btn.get_rect(center=rect.center))
+            profiler.end("overlays")
+
+        # Fin de partie (bombe, vies épuisées ou chrono Challenge écoulé)
+        if session.game_over:
+            save_replay()
+            if session.sub_mode == "STORM":
+                print("Mode Tempête :", storm_meter.report())
+            elif not autoplay:
+                add_to_leaderboard(saved_username, session.score, session.sub_mode)
+            if autoplay:
+                # Test d'endurance : on relance tout de suite le même mode
+                soak.game_over(session)
+                reset_game(session.sub_mode)
+            else:
+                game_state = "GAMEOVER"
 
-        if sub_mode == "CLASSIC" and lives <= 0:
-            # Enregistrer le score avant GAMEOVER (si pas déjà fait par la bomba)
-            if game_state != "GAMEOVER":
-                add_to_leaderboard(saved_username, score, sub_mode)
-            game_state = "GAMEOVER"
+    # Rien n'a changé sur l'écran statique : pas de redessin
+    elif dirty_rects == []:
+        pass
 
     # --- Écran USERNAME ---
     elif game_state == "USERNAME":
         # Fond semi-transparent sur DARK_BLUE
-        overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 30, 200))
-        screen.blit(overlay, (0, 0))
+        screen.blit(layer_cache.tint((WIDTH, HEIGHT), (0, 0, 30, 200)), (0, 0))
 
         # Titre
-        titre = font_huge.render("ENTRER VOTRE NOM", True, WHITE)
+        titre = render_text(font_huge, "ENTRER VOTRE NOM", True, WHITE)
         screen.blit(titre, titre.get_rect(center=(WIDTH // 2, 140)))
 
         # Sous-titre (mode à lancer)
         mode_label = (
             "Mode : CLASSIQUE" if pending_mode == "CLASSIC" else "Mode : CHALLENGE"
         )
-        sous_titre = font_small.render(mode_label, True, (180, 180, 255))
+        sous_titre = render_text(font_small, mode_label, True, (180, 180, 255))
         screen.blit(sous_titre, sous_titre.get_rect(center=(WIDTH // 2, 200)))
 
         # Zone d'input (rectangle arrondi)
@@ -693,9 +578,9 @@ while running:
 
         # Texte dans l'input
         if current_username:
-            input_text = font_huge.render(current_username, True, WHITE)
+            input_text = render_text(font_huge, current_username, True, WHITE)
         else:
-            input_text = font_huge.render("...", True, (100, 100, 100))  # placeholder
+            input_text = render_text(font_huge, "...", True, (100, 100, 100))  # placeholder
         screen.blit(input_text, input_text.get_rect(center=input_rect.center))
 
         # Curseur clignotant
@@ -713,18 +598,18 @@ while running:
             )
 
         # Instructions
-        instruct1 = font_small.render(
-            "Tapez votre nom puis appuyez sur ENTRÉE", True, (180, 180, 180)
+        instruct1 = render_text(
+            font_small, "Tapez votre nom puis appuyez sur ENTRÉE", True, (180, 180, 180)
         )
         screen.blit(instruct1, instruct1.get_rect(center=(WIDTH // 2, 350)))
-        instruct2 = font_small.render(
-            "(16 caractères max — ESC pour annuler)", True, (120, 120, 120)
+        instruct2 = render_text(
+            font_small, "(16 caractères max — ESC pour annuler)", True, (120, 120, 120)
         )
         screen.blit(instruct2, instruct2.get_rect(center=(WIDTH // 2, 380)))
 
         # Message d'erreur (nom déjà pris)
         if username_error:
-            err_surf = font_small.render(username_error, True, RED)
+            err_surf = render_text(font_small, username_error, True, RED)
             screen.blit(err_surf, err_surf.get_rect(center=(WIDTH // 2, 410)))
 
         # Bouton Valider (visuel, mais la validation se fait avec ENTRÉE)
@@ -736,45 +621,41 @@ while running:
             btn_col = (80, 80, 80)  # grisé si vide
         pygame.draw.rect(screen, btn_col, valider_rect, border_radius=10)
         pygame.draw.rect(screen, WHITE, valider_rect, 2, border_radius=10)
-        valider_txt = font_small.render("VALIDER", True, WHITE)
+        valider_txt = render_text(font_small, "VALIDER", True, WHITE)
         screen.blit(valider_txt, valider_txt.get_rect(center=valider_rect.center))
 
-        # Click sur le bouton Valider avec la souris
-        if (
-            pygame.mouse.get_pressed()[0]
-            and valider_rect.collidepoint(mouse_pos)
-            and can_validate
-        ):
-            if (
-                is_name_taken(current_username.strip())
-                and current_username.strip() != saved_username
-            ):
-                username_error = "Ce nom est déjà utilisé !"
-            else:
-                username_error = ""
-                saved_username = current_username.strip()
-                pygame.key.stop_text_input()
-                reset_game(pending_mode)
-
     # --- GAMEOVER ---
     elif game_state == "GAMEOVER":
         # Overlay sombre
-        overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 160))
-        screen.blit(overlay, (0, 0))
+        screen.blit(layer_cache.tint((WIDTH, HEIGHT), (0, 0, 0, 160)), (0, 0))
 
         # Titre
-        txt = font_huge.render("PARTIE TERMINEE", True, RED)
+        txt = render_text(font_huge, "PARTIE TERMINEE", True, RED)
         screen.blit(txt, txt.get_rect(center=(WIDTH // 2, 100)))
 
         # Nom du joueur et score
-        name_score = font_small.render(
-            f"{saved_username} — SCORE FINAL : {score}", True, WHITE
+        name_score = render_text(
+            font_small, f"{saved_username} — SCORE FINAL : {session.score}", True, WHITE
         )
         screen.blit(name_score, name_score.get_rect(center=(WIDTH // 2, 170)))
 
+        # Mode Tempête : résultat du test de capacité à la place du rang
+        if session.sub_mode == "STORM":
+            sustained = storm_meter.report()["sustained"]
+            storm_txt = render_text(
+                font_small,
+                f"Tenu à 60 FPS : {sustained.get('objects', 0)} objets, "
+                f"{sustained.get('slices', 0)} morceaux, "
+                f"{sustained.get('particles', 0)} particules",
+                True,
+                (100, 200, 255),
+            )
+            screen.blit(storm_txt, storm_txt.get_rect(center=(WIDTH // 2, 220)))
+
         # Rank du joueur dans le leaderboard
-        rank = get_player_rank(saved_username, score, sub_mode)
+        rank = None
+        if session.sub_mode != "STORM":
+            rank = get_player_rank(saved_username, session.score, session.sub_mode)
         if rank:
             if rank == 1:
                 rank_color = (255, 215, 0)  # Or
@@ -785,7 +666,7 @@ while running:
             else:
                 rank_color = (100, 200, 255)
                 rank_txt = f"Rang #{rank} au tableau des scores"
-            rank_surface = font_small.render(rank_txt, True, rank_color)
+            rank_surface = render_text(font_small, rank_txt, True, rank_color)
             screen.blit(rank_surface, rank_surface.get_rect(center=(WIDTH // 2, 220)))
 
         # Boutons (3 boutons verticaux)
@@ -798,7 +679,7 @@ while running:
             rect = pygame.Rect(bx, by, 300, 60)
             col = YELLOW if rect.collidepoint(mouse_pos) else WHITE
             pygame.draw.rect(screen, col, rect, 2, border_radius=10)
-            btn = font_small.render(label, True, col)
+            btn = render_text(font_small, label, True, col)
             screen.blit(btn, btn.get_rect(center=rect.center))
 
     # --- LEADERBOARD ---
@@ -806,12 +687,10 @@ while running:
         leaderboard = load_leaderboard()
 
         # Fond
-        overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 20, 220))
-        screen.blit(overlay, (0, 0))
+        screen.blit(layer_cache.tint((WIDTH, HEIGHT), (0, 0, 20, 220)), (0, 0))
 
         # Titre
-        titre = font_huge.render("TABLEAU DES SCORES", True, (255, 215, 0))
+        titre = render_text(font_huge, "TABLEAU DES SCORES", True, (255, 215, 0))
         screen.blit(titre, titre.get_rect(center=(WIDTH // 2, 45)))
 
         # En-têtes du tableau
@@ -832,7 +711,7 @@ while running:
         # Afficher les en-têtes
         x_offset = table_x
         for i, header in enumerate(headers):
-            h_surf = font_small.render(header, True, (150, 150, 200))
+            h_surf = render_text(font_small, header, True, (150, 150, 200))
             screen.blit(
                 h_surf,
                 (x_offset + col_widths[i] // 2 - h_surf.get_width() // 2, header_y),
@@ -853,8 +732,8 @@ while running:
 
         if not leaderboard:
             # Message si le tableau est vide
-            empty_txt = font_small.render(
-                "Aucun score enregistré pour le moment.", True, (120, 120, 120)
+            empty_txt = render_text(
+                font_small, "Aucun score enregistré pour le moment.", True, (120, 120, 120)
             )
             screen.blit(
                 empty_txt, empty_txt.get_rect(center=(WIDTH // 2, start_y + 40))
@@ -876,8 +755,8 @@ while running:
                 # Mettre en relief le joueur actuel
                 is_current = (
                     entry["name"] == saved_username
-                    and entry["score"] == score
-                    and entry["mode"] == sub_mode
+                    and entry["score"] == session.score
+                    and entry["mode"] == session.sub_mode
                 )
                 if is_current:
                     pygame.draw.rect(screen, (60, 60, 120), row_rect, border_radius=4)
@@ -910,7 +789,7 @@ while running:
                         if col_idx == 0
                         else (WHITE if is_current else (220, 220, 220))
                     )
-                    cell_surf = font_small.render(val, True, color)
+                    cell_surf = render_text(font_small, val, True, color)
                     cell_x = (
                         x_offset + col_widths[col_idx] // 2 - cell_surf.get_width() // 2
                     )
@@ -925,14 +804,14 @@ while running:
         for rect, label in [(btn_restart_rect, "RECOMMENCER"), (btn_menu_rect, "MENU")]:
             col = YELLOW if rect.collidepoint(mouse_pos) else WHITE
             pygame.draw.rect(screen, col, rect, 2, border_radius=10)
-            btn = font_small.render(label, True, col)
+            btn = render_text(font_small, label, True, col)
             screen.blit(btn, btn.get_rect(center=rect.center))
 
     # --- MENU ---
     else:  # MENU
         # Si tu as menu.png / title.png, on les affiche automatiquement
         if not menu_bg:
-            txt = font_huge.render("FRUIT SLICER GAME", True, WHITE)
+            txt = render_text(font_huge, "FRUIT SLICER GAME", True, WHITE)
             screen.blit(txt, txt.get_rect(center=(WIDTH // 2, 150)))
         if title_menu:
             title_rect = title_menu.get_rect(center=(WIDTH // 2, 150))
@@ -941,36 +820,63 @@ while running:
         # Bouton vers le leaderboard depuis le menu (au-dessus des commandes)
         lb_rect = pygame.Rect(WIDTH // 2 - 150, 440, 300, 30)
         lb_col = (255, 215, 0) if lb_rect.collidepoint(mouse_pos) else (150, 150, 200)
-        lb_txt = font_small.render("📊 Voir le tableau des scores", True, lb_col)
+        lb_txt = render_text(font_small, "📊 Voir le tableau des scores", True, lb_col)
         screen.blit(lb_txt, lb_txt.get_rect(center=lb_rect.center))
-        if pygame.mouse.get_pressed()[0] and lb_rect.collidepoint(mouse_pos):
-            game_state = "LEADERBOARD"
 
         # Guide des touches
-        texte_bouton = font_small.render("COMMANDE EN JEU :", True, (255, 255, 255))
+        texte_bouton = render_text(font_small, "COMMANDE EN JEU :", True, (255, 255, 255))
         texte_rect = texte_bouton.get_rect(center=(WIDTH // 2, 495))
         screen.blit(texte_bouton, texte_rect)
 
         pygame.draw.rect(
             screen, (255, 80, 80), (WIDTH // 2 - 250, 520, 200, 50), 2, border_radius=10
         )
-        lbl_l = font_small.render("BONUS : A W S D", True, (255, 80, 80))
+        lbl_l = render_text(font_small, "BONUS : A W S D", True, (255, 80, 80))
         screen.blit(lbl_l, lbl_l.get_rect(center=(WIDTH // 2 - 150, 542)))
 
         pygame.draw.rect(
             screen, (80, 255, 80), (WIDTH // 2 + 50, 520, 200, 50), 2, border_radius=10
         )
-        lbl_r = font_small.render("FRUITS : J K L", True, (80, 255, 80))
+        lbl_r = render_text(font_small, "FRUITS : J K L", True, (80, 255, 80))
         screen.blit(lbl_r, lbl_r.get_rect(center=(WIDTH // 2 + 150, 542)))
 
+        # Lien vers le mode Tempête (test de capacité du moteur)
+        storm_rect = pygame.Rect(WIDTH // 2 - 150, 575, 300, 22)
+        storm_col = YELLOW if storm_rect.collidepoint(mouse_pos) else (150, 150, 200)
+        storm_lbl = render_text(font_small, "Mode Tempête (test de capacité)", True, storm_col)
+        screen.blit(storm_lbl, storm_lbl.get_rect(center=storm_rect.center))
+
         for i, label in enumerate(["CLASSIQUE", "CHALLENGE"]):
             rect = pygame.Rect(WIDTH // 2 - 150, 280 + i * 90, 300, 60)
             col = (GREEN if i == 0 else RED) if rect.collidepoint(mouse_pos) else WHITE
             pygame.draw.rect(screen, col, rect, 2, border_radius=10)
-            btn = font_huge.render(label, True, col)
+            btn = render_text(font_huge, label, True, col)
             screen.blit(btn, btn.get_rect(center=rect.center))
 
-    pygame.display.flip()
-    clock.tick(60)
-
-pygame.quit()
\ No newline at end of file
+    profiler.draw(screen, font_profiler)
+    latency.draw(screen, font_profiler)
+    profiler.begin("flip")
+    latency.before_flip()
+    if dirty_rects is None:
+        pygame.display.flip()
+    elif dirty_rects:
+        pygame.display.update(dirty_rects)
+    latency.after_flip()
+    loader.frame_shown()
+    if loader.done and not load_reported:
+        report = loader.report()
+        print(f"Assets : première image à {report['first_frame_ms']:.0f} ms, "
+              f"tout chargé à {report['fully_loaded_ms']:.0f} ms")
+        load_reported = True
+    profiler.end("flip")
+    profiler.end_frame()
+    layer_cache.end_frame()
+
+leaderboard_store.flush()
+if latency.used and latency.samples:
+    print("Latence exportée :", latency.export())
+if soak is not None:
+    soak.sample(session)
+    print("Endurance :", soak.report())
+    print("Relevés exportés :", soak.export())
+pygame.quit()
@@ -1,35 +1,118 @@
 import pygame
+import math
 import random
 from settings import *
-from assets import font_letter
+from assets import LETTER_SHADOW, get_half, get_letter, layer_cache, rotation_cache
+from physics import ArrayBody, PhysicsWorld
+
+# Générateur aléatoire des entités, ré-initialisé avec la graine de chaque partie (replays)
+rng = random.Random()
+
+SPECIAL_TYPES = ["bomb", "shuriken", "ice_block", "lightning"]
+# Boîtes englobantes pour écarter les sprites hors écran (sprite pivoté, halo et lettre)
+SLICE_BOUNDS = 70
+OBJECT_BOUNDS = (90, 130)
+
+
+# --- Réserves d'objets ---
+class Pool:
+    """ Réserve d'objets réutilisables : évite d'allouer (et de faire travailler le GC) en jeu
+
+    La classe gérée doit avoir une méthode reset() qui prend les mêmes arguments
+    que son constructeur.
+    """
+    def __init__(self, cls, max_size=256):
+        self.cls = cls
+        self.max_size = max_size  # Nombre maximum d'objets gardés en réserve
+        self.free = []
+        self.created = self.reused = self.dropped = 0
+
+    def acquire(self, *args):
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args)
+            self.reused += 1
+        else:
+            obj = self.cls(*args)
+            self.created += 1
+        return obj
+
+    def release(self, obj):
+        if len(self.free) < self.max_size:
+            self.free.append(obj)
+        else:
+            self.dropped += 1
+
+    def stats(self):
+        total = self.created + self.reused
+        return {
+            "created": self.created,
+            "reused": self.reused,
+            "dropped": self.dropped,
+            "free": len(self.free),
+            "reuse_rate": self.reused / total if total else 0.0,
+        }
+
+
+_fruit_types_cache = {}  # Noms des images (tuple) -> fruits
+
+
+def _fruit_types(image_data):
+    """Liste des fruits (sans bonus ni bombe), calculée une fois par ensemble de noms d'images
+
+    La clé est la liste des noms elle-même : pas de résultat périmé si le
+    dictionnaire change ou si un autre dictionnaire réutilise le même id().
+    """
+    names = tuple(image_data)
+    types = _fruit_types_cache.get(names)
+    if types is None:
+        types = _fruit_types_cache[names] = [k for k in names if k not in SPECIAL_TYPES]
+    return types
+
 
 # --- Classes ---
 class LightningEffect:
     """ Gère les éclairs visuels pendant la surcharge """
     def __init__(self):
         self.points = []
+        self.reset()
+
+    def reset(self):
+        """Nouvel éclair (réutilise les listes de points existantes)"""
         self.life = 10
-        curr_pos = [random.randint(0, WIDTH), 0]
-        self.points.append(curr_pos)
-        while curr_pos[1] < HEIGHT:
-            curr_pos = [
-                curr_pos[0] + random.randint(-50, 50),
-                curr_pos[1] + random.randint(20, 80),
-            ]
-            self.points.append(curr_pos)
+        points = self.points
+        x, y = rng.randint(0, WIDTH), 0
+        n = 0
+        while True:
+            if n < len(points):
+                points[n][0], points[n][1] = x, y
+            else:
+                points.append([x, y])
+            n += 1
+            if y >= HEIGHT:
+                break
+            x += rng.randint(-50, 50)
+            y += rng.randint(20, 80)
+        del points[n:]
+
+    def update(self):
+        """Un pas de simulation (la durée de l'éclair ne dépend pas du nombre d'images)"""
+        self.life -= 1
 
     def draw(self, surf):
         if self.life > 0:
             pygame.draw.lines(surf, WHITE, False, self.points, 3)
             pygame.draw.lines(surf, ICE_BLUE, False, self.points, 1)
-            self.life -= 1
 
 
 class Particle:
     """ Particules d'explosion lors de la découpe """
     def __init__(self, x, y, color=WHITE):
+        self.reset(x, y, color)
+
+    def reset(self, x, y, color=WHITE):
         self.x, self.y, self.color = x, y, color
-        self.vx, self.vy, self.life = random.uniform(-5, 5), random.uniform(-5, 5), 255
+        self.vx, self.vy, self.life = rng.uniform(-5, 5), rng.uniform(-5, 5), 255
 
     def update(self):
         self.x += self.vx
@@ -38,69 +121,91 @@ class Particle:
 
     def draw(self, surf):
         if self.life > 0:
-            p = pygame.Surface((5, 5), pygame.SRCALPHA)
-            p.fill((*self.color, self.life))
-            surf.blit(p, (self.x, self.y))
+            surf.blit(layer_cache.tint((5, 5), (*self.color, self.life)), (self.x, self.y))
 
 
 class FruitSlice:
     """ Moitiés de fruits après découpe """
-    def __init__(self, image, x, y, side):
-        w, h = image.get_size()
-        self.image = pygame.Surface((w // 2, h), pygame.SRCALPHA)
-        self.image.blit(image, (0, 0), (0 if side == "left" else w // 2, 0, w // 2, h))
+    def __init__(self, image, x, y, side, kind=None):
+        self.reset(image, x, y, side, kind)
+
+    def reset(self, image, x, y, side, kind=None):
+        # Moitié partagée entre toutes les tranches du même type (sans allocation)
+        self.key = (kind if kind is not None else image, side)
+        self.image = get_half(self.key[0], image, side)
         self.vx = -7 if side == "left" else 7
         self.x, self.y, self.vy, self.angle = x, y, -10, 0
+        self.prev_x, self.prev_y, self.prev_angle = x, y, 0
 
     def update(self):
+        self.prev_x, self.prev_y, self.prev_angle = self.x, self.y, self.angle
         self.vy += 0.5
         self.x += self.vx
         self.y += self.vy
         self.angle += 12
 
-    def draw(self, surf):
-        rot = pygame.transform.rotate(self.image, self.angle)
-        surf.blit(rot, (self.x, self.y))
+    def interpolate(self, alpha):
+        """Position et angle interpolés entre les deux derniers pas de simulation"""
+        return (
+            self.prev_x + (self.x - self.prev_x) * alpha,
+            self.prev_y + (self.y - self.prev_y) * alpha,
+            self.prev_angle + (self.angle - self.prev_angle) * alpha,
+        )
+
+    def draw(self, surf, alpha=1.0):
+        x, y, angle = self.interpolate(alpha)
+        rot = rotation_cache.get(self.key, self.image, angle)
+        surf.blit(rot, (x, y))
+
+    def enqueue(self, queue, x, y, angle):
+        """Comme draw(), mais ajoute le sprite à une RenderQueue (rien si hors écran)"""
+        if queue.visible(x, y, SLICE_BOUNDS, SLICE_BOUNDS):
+            queue.add(rotation_cache.get(self.key, self.image, angle), (x, y))
 
 
 class GameObject:
     """ Fruits, bombes et bonus """
     def __init__(self, image_data, is_overcharged, speed_mult=1.0):
+        self.reset(image_data, is_overcharged, speed_mult)
+
+    def reset(self, image_data, is_overcharged, speed_mult=1.0):
         # Halo doré
-        self.is_enrobed = (random.random() < 0.15) if not is_overcharged else False
+        self.is_enrobed = (rng.random() < 0.15) if not is_overcharged else False
 
         # Sélection du type d'objet
         if is_overcharged:
-            self.type = random.choice([k for k in image_data.keys() if k not in ["bomb", "shuriken", "ice_block", "lightning"]])
+            self.type = rng.choice(_fruit_types(image_data))
         else:
-            rand = random.random()
+            rand = rng.random()
             if rand < 0.05: self.type = "ice_block"
             elif rand < 0.10: self.type = "lightning"
             elif rand < 0.18: self.type = "shuriken"
             elif rand < 0.28: self.type = "bomb"
             else:
-                self.type = random.choice([k for k in image_data.keys() if k not in ["shuriken", "bomb", "ice_block", "lightning"]])
+                self.type = rng.choice(_fruit_types(image_data))
         
         self.image_orig = image_data[self.type]
         self.is_bonus = self.type in ["bomb", "ice_block", "lightning", "shuriken"]
 
         # Attribution des touches et positions (Bonus à gauche, Fruits à droite)
         if self.is_bonus:
-            self.letter = random.choice("awsd")
+            self.letter = rng.choice("awsd")
             self.color_label = RED
-            self.x = random.randint(50, WIDTH // 2 - 50)
+            self.x = rng.randint(50, WIDTH // 2 - 50)
         else:
-            self.letter = random.choice("jkl")
+            self.letter = rng.choice("jkl")
             self.color_label = GREEN
-            self.x = random.randint(WIDTH // 2 + 50, WIDTH - 100)
+            self.x = rng.randint(WIDTH // 2 + 50, WIDTH - 100)
 
         self.y = HEIGHT + 20
-        self.vy = random.uniform(-16, -21) * speed_mult
-        self.vx = random.uniform(-1.5, 1.5)
-        self.angle, self.rot_speed = 0, random.randint(-4, 4)
+        self.vy = rng.uniform(-16, -21) * speed_mult
+        self.vx = rng.uniform(-1.5, 1.5)
+        self.angle, self.rot_speed = 0, rng.randint(-4, 4)
+        self.prev_x, self.prev_y, self.prev_angle = self.x, self.y, self.angle
         self.hp = 2 if self.is_enrobed else 1
 
     def move(self, is_slowed=False):
+        self.prev_x, self.prev_y, self.prev_angle = self.x, self.y, self.angle
         # Application du bonus glaçon
         factor = 0 if is_slowed else 1.0
         self.vy += 0.35 * factor
@@ -108,15 +213,75 @@ class GameObject:
         self.x += self.vx * factor
         self.angle += self.rot_speed * factor
 
-    def draw(self, surf):
+    def exit_steps(self):
+        """Nombre de pas de mouvement (hors glaçon) avant que l'objet ne sorte par le bas
+
+        Seule mesure d'urgence du jeu (plus petit = plus urgent) : index des lettres et bot.
+        """
+        # Après k pas : y + k * vy + 0.35 * k * (k + 1) / 2 > HEIGHT + 100
+        a, b, c = 0.175, self.vy + 0.175, self.y - (HEIGHT + 100)
+        root = (-b + math.sqrt(max(0.0, b * b - 4 * a * c))) / (2 * a)
+        return max(0, math.floor(root) + 1)
+
+    def interpolate(self, alpha):
+        """Position et angle interpolés entre les deux derniers pas de simulation"""
+        return (
+            self.prev_x + (self.x - self.prev_x) * alpha,
+            self.prev_y + (self.y - self.prev_y) * alpha,
+            self.prev_angle + (self.angle - self.prev_angle) * alpha,
+        )
+
+    def draw(self, surf, alpha=1.0):
+        x, y, angle = self.interpolate(alpha)
         if self.is_enrobed and self.hp > 0:
-            pygame.draw.circle(surf, GOLD, (int(self.x + 30), int(self.y + 30)), 42, 5)
-        rotated = pygame.transform.rotate(self.image_orig, self.angle)
-        rect = rotated.get_rect(center=(self.x + 30, self.y + 30))
+            halo = layer_cache.halo(42, 5, GOLD)
+            surf.blit(halo, halo.get_rect(center=(int(x + 30), int(y + 30))))
+        rotated = rotation_cache.get(self.type, self.image_orig, angle)
+        rect = rotated.get_rect(center=(x + 30, y + 30))
         surf.blit(rotated, rect.topleft)
         
         # Affichage des lettres (clavier)
-        shadow = font_letter.render(self.letter.upper(), True, (20, 20, 20))
-        surf.blit(shadow, (self.x + 17, self.y + 62))
-        txt = font_letter.render(self.letter.upper(), True, self.color_label)
-        surf.blit(txt, (self.x + 15, self.y + 60))
+        surf.blit(get_letter(self.letter, LETTER_SHADOW), (x + 17, y + 62))
+        surf.blit(get_letter(self.letter, self.color_label), (x + 15, y + 60))
+
+    def enqueue(self, queue, x, y, angle):
+        """Comme draw(), mais ajoute halo, sprite et lettres à une RenderQueue (rien si hors écran)"""
+        if not queue.visible(x - 15, y - 15, *OBJECT_BOUNDS):
+            return
+        if self.is_enrobed and self.hp > 0:
+            halo = layer_cache.halo(42, 5, GOLD)
+            queue.add(halo, halo.get_rect(center=(int(x + 30), int(y + 30))))
+        rotated = rotation_cache.get(self.type, self.image_orig, angle)
+        queue.add(rotated, rotated.get_rect(center=(x + 30, y + 30)))
+        queue.add(get_letter(self.letter, LETTER_SHADOW), (x + 17, y + 62))
+        queue.add(get_letter(self.letter, self.color_label), (x + 15, y + 60))
+
+
+# --- Variantes à physique vectorisée (voir PhysicsWorld et array_pools) ---
+class ArrayGameObject(ArrayBody, GameObject):
+    pass
+
+
+class ArrayFruitSlice(ArrayBody, FruitSlice):
+
+    def reset(self, *args):
+        super().reset(*args)
+        self.rot_speed = 12
+
+
+# Réserves partagées (voir Pool)
+object_pool = Pool(GameObject, max_size=128)
+slice_pool = Pool(FruitSlice, max_size=256)
+lightning_pool = Pool(LightningEffect, max_size=64)
+
+
+def array_pools():
+    """Réserves à physique vectorisée d'une session, chacune avec son propre PhysicsWorld
+
+    Un monde ne doit pas être partagé : son step() ferait aussi avancer (et
+    tomber) les objets de l'autre session.
+    """
+    objects = type("ArrayGameObject", (ArrayGameObject,), {"world": PhysicsWorld(gravity=0.35)})
+    slices = type("ArrayFruitSlice", (ArrayFruitSlice,),
+                  {"world": PhysicsWorld(gravity=0.5, slowable=False)})
+    return Pool(objects, max_size=128), Pool(slices, max_size=256)
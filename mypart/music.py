@@ -0,0 +1,151 @@
+""" Musiques d'ambiance lues en streaming (pygame.mixer.music)
+
+Une piste chargée avec pygame.mixer.Sound est décodée entièrement en PCM et
+reste en mémoire ; pygame.mixer.music ne lit que le morceau en cours depuis le
+disque. MusicPlayer associe une piste à chaque état du jeu (MENU, PLAY) et
+passe de l'une à l'autre en fondu.
+
+pygame.mixer.music n'a qu'un seul flux : le fondu est enchaîné (la piste
+sortante baisse pendant fade_ms, puis l'entrante monte pendant fade_ms) et
+update() doit être appelé à chaque frame pour lancer la piste suivante.
+
+Mémoire évitée : python music.py fichier.mp3 [...]
+"""
+import os
+import struct
+import sys
+import wave
+import pygame
+
+MUSIC_FADE_MS = 800
+MUSIC_VOLUME = 0.5
+
+# Débits (kbit/s) des en-têtes MPEG Layer III : MPEG-1, puis MPEG-2 et 2.5
+MP3_BITRATES = {
+    1: [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    2: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+MP3_RATES = [44100, 48000, 32000]
+
+
+def _mp3_seconds(path):
+    """Durée d'un MP3 d'après son premier en-tête (nombre de trames Xing/Info, sinon débit constant)"""
+    with open(path, "rb") as f:
+        data = f.read(64 * 1024)
+    size = os.path.getsize(path)
+    start = 0
+    if data[:3] == b"ID3":  # Tag ID3v2 : taille codée sur 4 x 7 bits
+        start = 10 + (data[6] << 21 | data[7] << 14 | data[8] << 7 | data[9])
+        with open(path, "rb") as f:
+            f.seek(start)
+            data = f.read(64 * 1024)
+    for i in range(len(data) - 4):
+        header, = struct.unpack_from(">I", data, i)
+        if header >> 21 != 0x7FF or (header >> 17) & 3 != 1:  # Synchro + Layer III
+            continue
+        version = (header >> 19) & 3  # 3 : MPEG-1, 2 : MPEG-2, 0 : MPEG-2.5
+        bitrate_index, rate_index = (header >> 12) & 15, (header >> 10) & 3
+        if version == 1 or bitrate_index in (0, 15) or rate_index == 3:
+            continue
+        rate = MP3_RATES[rate_index] >> {3: 0, 2: 1, 0: 2}[version]
+        samples = 1152 if version == 3 else 576
+        for tag in (b"Xing", b"Info"):
+            pos = data.find(tag, i, i + 200)
+            if pos >= 0 and data[pos + 7] & 1:
+                frames, = struct.unpack_from(">I", data, pos + 8)
+                return frames * samples / rate
+        bitrate = MP3_BITRATES[1 if version == 3 else 2][bitrate_index] * 1000
+        return (size - start - i) * 8 / bitrate
+    return None
+
+
+def track_seconds(path):
+    """Durée d'une piste sans la décoder (WAV et MP3), None si inconnue"""
+    try:
+        if path.lower().endswith(".wav"):
+            with wave.open(path) as w:
+                return w.getnframes() / w.getframerate()
+        if path.lower().endswith(".mp3"):
+            return _mp3_seconds(path)
+    except (OSError, EOFError, wave.Error, struct.error):
+        pass
+    return None
+
+
+def decoded_bytes(seconds):
+    """Mémoire qu'occuperait la piste décodée en Sound, au format du mixer"""
+    init = pygame.mixer.get_init()
+    if init is None or seconds is None:
+        return 0
+    freq, size, channels = init
+    return int(seconds * freq * channels * abs(size) // 8)
+
+
+class MusicPlayer:
+    """ Une ambiance par état du jeu, lue en streaming, avec fondu entre les pistes """
+    def __init__(self, tracks, fade_ms=MUSIC_FADE_MS, volume=MUSIC_VOLUME):
+        self.tracks = tracks  # état -> chemin (None : pas de musique)
+        self.fade_ms = fade_ms
+        self.volume = volume
+        self.current = None  # État dont la piste joue (ou baisse en fondu)
+        self.pending = None  # État à lancer quand le fondu sortant est fini
+
+    def play(self, state):
+        """Passe à l'ambiance de `state` (rien à faire si elle joue déjà)"""
+        if state == (self.pending or self.current):
+            return
+        if self.current is not None and pygame.mixer.music.get_busy():
+            pygame.mixer.music.fadeout(self.fade_ms)
+            self.pending = state
+        else:
+            self._start(state)
+
+    def update(self):
+        """À appeler à chaque frame : lance la piste suivante à la fin du fondu"""
+        if self.pending is not None and not pygame.mixer.music.get_busy():
+            state, self.pending = self.pending, None
+            self._start(state)
+
+    def _start(self, state):
+        self.current = state
+        path = self.tracks.get(state)
+        if path is None:
+            return
+        try:
+            pygame.mixer.music.load(path)
+            pygame.mixer.music.set_volume(self.volume)
+            pygame.mixer.music.play(-1, fade_ms=self.fade_ms)
+        except pygame.error as e:
+            print(f"Erreur : impossible de lire la musique {path} ({e})")
+
+    def report(self):
+        """Mémoire audio résidente évitée : le PCM des pistes si elles étaient chargées en Sound"""
+        tracks = {}
+        for state, path in self.tracks.items():
+            if path is None:
+                continue
+            seconds = track_seconds(path)
+            tracks[state] = {
+                "file": os.path.basename(path),
+                "seconds": seconds,
+                "decoded_bytes": decoded_bytes(seconds),
+            }
+        return {
+            "tracks": tracks,
+            "saved_bytes": sum(track["decoded_bytes"] for track in tracks.values()),
+        }
+
+
+def main():
+    pygame.mixer.init()
+    player = MusicPlayer({os.path.basename(path): path for path in sys.argv[1:]})
+    report = player.report()
+    for track in report["tracks"].values():
+        seconds = track["seconds"]
+        duration = f"{seconds:6.1f} s" if seconds is not None else "durée inconnue"
+        print(f"{track['file']:<24} {duration} -> {track['decoded_bytes'] / 1024 / 1024:6.1f} Mo en Sound")
+    print(f"Mémoire évitée en streaming : {report['saved_bytes'] / 1024 / 1024:.1f} Mo")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+import numpy as np
+import pygame
+from settings import *
+
+PARTICLE_SIZE = 5
+PARTICLE_SPEED = 5.0
+PARTICLE_FADE = 15  # Perte de vie (alpha) par frame
+ALPHA_LEVELS = 255 // PARTICLE_FADE + 1  # Une texture par niveau de transparence
+
+
+class ParticleSystem:
+    """ Toutes les particules dans des tableaux NumPy (une colonne par attribut) """
+    def __init__(self, capacity=1024, max_particles=PARTICLE_MAX):
+        self.max_particles = max_particles
+        self.rng = np.random.default_rng()
+        self.count = 0
+        self._allocate(capacity)
+        # Palette des couleurs et textures pré-calculées (une par couleur et par alpha)
+        self.palette = {}
+        self.stamps = []
+
+    def _allocate(self, capacity):
+        self.x = np.zeros(capacity, np.float32)
+        self.y = np.zeros(capacity, np.float32)
+        self.vx = np.zeros(capacity, np.float32)
+        self.vy = np.zeros(capacity, np.float32)
+        self.life = np.zeros(capacity, np.int16)
+        self.color = np.zeros(capacity, np.int16)
+
+    def _grow(self, needed):
+        capacity = len(self.x)
+        while capacity < needed:
+            capacity *= 2
+        old = (self.x, self.y, self.vx, self.vy, self.life, self.color)
+        self._allocate(capacity)
+        n = self.count
+        for new, prev in zip((self.x, self.y, self.vx, self.vy, self.life, self.color), old):
+            new[:n] = prev[:n]
+
+    def _color_index(self, color):
+        color = tuple(color)
+        idx = self.palette.get(color)
+        if idx is None:
+            idx = len(self.palette)
+            self.palette[color] = idx
+            for level in range(ALPHA_LEVELS):
+                stamp = pygame.Surface((PARTICLE_SIZE, PARTICLE_SIZE), pygame.SRCALPHA)
+                stamp.fill((*color, level * PARTICLE_FADE))
+                self.stamps.append(stamp)
+        return idx
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+
+    def seed(self, seed):
+        """Ré-initialise le générateur aléatoire (parties reproductibles)"""
+        self.rng = np.random.default_rng(seed)
+
+    def emit(self, x, y, color=WHITE, count=1):
+        """Ajoute `count` particules au point (x, y) avec des vitesses aléatoires"""
+        count = min(count, self.max_particles - self.count)
+        if count <= 0:
+            return
+        start, end = self.count, self.count + count
+        if end > len(self.x):
+            self._grow(end)
+        self.x[start:end] = x
+        self.y[start:end] = y
+        self.vx[start:end] = self.rng.uniform(-PARTICLE_SPEED, PARTICLE_SPEED, count)
+        self.vy[start:end] = self.rng.uniform(-PARTICLE_SPEED, PARTICLE_SPEED, count)
+        self.life[start:end] = 255
+        self.color[start:end] = self._color_index(color)
+        self.count = end
+
+    def update(self):
+        """Avance toutes les particules d'une frame et retire les particules mortes"""
+        n = self.count
+        if n == 0:
+            return
+        self.x[:n] += self.vx[:n]
+        self.y[:n] += self.vy[:n]
+        self.life[:n] -= PARTICLE_FADE
+
+        alive = self.life[:n] > 0
+        kept = int(np.count_nonzero(alive))
+        if kept < n:
+            for arr in (self.x, self.y, self.vx, self.vy, self.life, self.color):
+                arr[:kept] = arr[:n][alive]
+            self.count = kept
+
+    def draw(self, surf, alpha=1.0):
+        n = self.count
+        if n == 0:
+            return
+        # Mouvement linéaire : on recule de la fraction de pas pas encore écoulée
+        back = 1.0 - alpha
+        # Texture = couleur * ALPHA_LEVELS + niveau d'alpha
+        stamp_idx = self.color[:n] * ALPHA_LEVELS + self.life[:n] // PARTICLE_FADE
+        stamps = map(self.stamps.__getitem__, stamp_idx.tolist())
+        xs = (self.x[:n] - self.vx[:n] * back).astype(np.int32).tolist()
+        ys = (self.y[:n] - self.vy[:n] * back).astype(np.int32).tolist()
+        surf.blits(zip(stamps, zip(xs, ys)), doreturn=False)
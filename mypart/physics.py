@@ -0,0 +1,105 @@
+import numpy as np
+from settings import *
+
+# Une ligne du tableau par attribut, une colonne par corps
+FIELDS = ("x", "y", "vx", "vy", "angle", "rot_speed", "prev_x", "prev_y", "prev_angle")
+X, Y, VX, VY, ANGLE, ROT_SPEED, PREV_X, PREV_Y, PREV_ANGLE = range(len(FIELDS))
+
+
+class PhysicsWorld:
+    """ Position, vitesse et angle de tous les corps d'un même type dans un tableau NumPy
+
+    step() fait avancer tous les corps d'un coup (gravité, vitesse, rotation) et
+    retourne ceux qui sont sortis par le bas. Les suppressions se font en O(1) en
+    déplaçant le dernier corps dans l'emplacement libéré.
+    """
+    def __init__(self, gravity, slowable=True, capacity=256, despawn_y=HEIGHT + 100):
+        self.gravity = gravity
+        self.slowable = slowable  # Les corps sont-ils figés par le glaçon ?
+        self.despawn_y = despawn_y
+        self.data = np.zeros((len(FIELDS), capacity))
+        self.owners = []  # owners[slot] : objet Python qui possède la colonne
+
+    def __len__(self):
+        return len(self.owners)
+
+    def attach(self, owner):
+        """Réserve une colonne pour `owner` (ses attributs physiques y seront stockés)"""
+        slot = len(self.owners)
+        if slot == self.data.shape[1]:
+            data = np.zeros((len(FIELDS), slot * 2))
+            data[:, :slot] = self.data
+            self.data = data
+        self.data[:, slot] = 0.0
+        self.owners.append(owner)
+        owner.slot = slot
+
+    def detach(self, owner):
+        slot, last = owner.slot, len(self.owners) - 1
+        if slot != last:
+            # Le dernier corps prend la place libérée
+            self.data[:, slot] = self.data[:, last]
+            moved = self.owners[last]
+            self.owners[slot] = moved
+            moved.slot = slot
+        self.owners.pop()
+        owner.slot = -1
+
+    def clear(self):
+        for owner in self.owners:
+            owner.slot = -1
+        self.owners.clear()
+
+    def step(self, is_slowed=False):
+        """Avance tous les corps d'un pas et retourne ceux à faire disparaître"""
+        n = len(self.owners)
+        if not n:
+            return []
+        d = self.data[:, :n]
+        d[PREV_X], d[PREV_Y], d[PREV_ANGLE] = d[X], d[Y], d[ANGLE]
+        # Glaçon : facteur 0 pour tout le tableau, rien ne bouge
+        if not (is_slowed and self.slowable):
+            d[VY] += self.gravity
+            d[X] += d[VX]
+            d[Y] += d[VY]
+            d[ANGLE] += d[ROT_SPEED]
+        owners = self.owners
+        return [owners[i] for i in np.flatnonzero(d[Y] > self.despawn_y)]
+
+    def interpolate(self, alpha):
+        """Positions et angles interpolés de tous les corps (listes indexées par slot)"""
+        d = self.data[:, :len(self.owners)]
+        return (
+            (d[PREV_X] + (d[X] - d[PREV_X]) * alpha).tolist(),
+            (d[PREV_Y] + (d[Y] - d[PREV_Y]) * alpha).tolist(),
+            (d[PREV_ANGLE] + (d[ANGLE] - d[PREV_ANGLE]) * alpha).tolist(),
+        )
+
+
+def _field(row):
+    def get(self):
+        return self.world.data[row, self.slot]
+
+    def set(self, value):
+        self.world.data[row, self.slot] = value
+
+    return property(get, set)
+
+
+class ArrayBody:
+    """ Mixin : les attributs physiques de l'objet sont lus et écrits dans son PhysicsWorld
+
+    La sous-classe définit `world`. L'objet prend une colonne au reset() et la
+    rend avec world.detach() quand il quitte la partie.
+    """
+    world = None
+    slot = -1
+
+    x, y, vx, vy = _field(X), _field(Y), _field(VX), _field(VY)
+    angle, rot_speed = _field(ANGLE), _field(ROT_SPEED)
+    prev_x, prev_y, prev_angle = _field(PREV_X), _field(PREV_Y), _field(PREV_ANGLE)
+
+    def reset(self, *args):
+        if self.slot < 0:
+            self.world.attach(self)
+        super().reset(*args)
@@ -0,0 +1,273 @@
+import gc
+import json
+import os
+import time
+from collections import deque
+import pygame
+from settings import *
+
+
+class _NullPhase:
+    """ Chronomètre vide utilisé quand le profiler est désactivé (aucune mesure) """
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_PHASE = _NullPhase()
+
+
+class _Phase:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class FrameProfiler:
+    """ Temps passé dans chaque phase de la frame (moyenne glissante, p95, p99) """
+    def __init__(self, window=300, enabled=False):
+        self.window = window  # Nombre de frames gardées pour les statistiques
+        self.enabled = enabled
+        self.samples = {}  # phase -> deque des durées (ms), une valeur par frame
+        self.current = {}  # phase -> durée cumulée pendant la frame en cours (s)
+        self._starts = {}
+        self.frame_start = None
+        self.lines = []  # Texte de l'overlay (rafraîchi périodiquement)
+        self.frames = 0
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.current.clear()
+        self._starts.clear()
+        self.frame_start = None
+
+    def begin(self, name):
+        """Début d'une phase (variante de phase() sans bloc `with`)"""
+        if self.enabled:
+            self._starts[name] = time.perf_counter()
+
+    def end(self, name):
+        if self.enabled and name in self._starts:
+            self.add(name, time.perf_counter() - self._starts.pop(name))
+
+    def phase(self, name):
+        """À utiliser avec `with` : mesure la durée du bloc (no-op si désactivé)"""
+        if not self.enabled:
+            return NULL_PHASE
+        return _Phase(self, name)
+
+    def add(self, name, seconds):
+        self.current[name] = self.current.get(name, 0.0) + seconds
+
+    def end_frame(self):
+        """Range les durées de la frame écoulée dans les fenêtres glissantes"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self.frame_start is not None:
+            self.current["frame"] = now - self.frame_start
+            for name, seconds in self.current.items():
+                if name not in self.samples:
+                    self.samples[name] = deque(maxlen=self.window)
+                self.samples[name].append(seconds * 1000)
+        self.frame_start = now
+        self.current = {}
+        self.frames += 1
+
+    def stats(self):
+        """Statistiques par phase : moyenne, p95, p99 et max (en ms)"""
+        result = {}
+        for name, values in self.samples.items():
+            ordered = sorted(values)
+            n = len(ordered)
+            result[name] = {
+                "avg": sum(ordered) / n,
+                "p95": ordered[min(n - 1, int(n * 0.95))],
+                "p99": ordered[min(n - 1, int(n * 0.99))],
+                "max": ordered[-1],
+                "frames": n,
+            }
+        return result
+
+    def export(self, path=None, extra=None):
+        """Écrit les statistiques et les mesures brutes dans un fichier JSON"""
+        if path is None:
+            path = time.strftime("profile_%Y%m%d_%H%M%S.json")
+        data = {
+            "stats": self.stats(),
+            "samples": {name: list(values) for name, values in self.samples.items()},
+        }
+        if extra:
+            data.update(extra)
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
+        return path
+
+    def draw(self, surf, font, refresh=30):
+        """Overlay en bas à gauche (le texte n'est recalculé que toutes les `refresh` frames)"""
+        if not self.enabled:
+            return
+        if self.frames % refresh == 0 or not self.lines:
+            stats = self.stats()
+            order = sorted(stats, key=lambda name: (name == "frame", -stats[name]["avg"]))
+            self.lines = [
+                font.render(
+                    f"{name:<9} {stats[name]['avg']:6.2f} | p95 {stats[name]['p95']:6.2f}"
+                    f" | p99 {stats[name]['p99']:6.2f} ms",
+                    True,
+                    YELLOW if name == "frame" else WHITE,
+                )
+                for name in order
+            ]
+        if not self.lines:
+            return
+        line_h = self.lines[0].get_height()
+        width = max(line.get_width() for line in self.lines) + 16
+        height = line_h * len(self.lines) + 12
+        top = HEIGHT - height - 10
+        pygame.draw.rect(surf, (0, 0, 0), (10, top, width, height))
+        for i, line in enumerate(self.lines):
+            surf.blit(line, (18, top + 6 + i * line_h))
+
+
+class CapacityMeter:
+    """ Mode Tempête : plus grand nombre d'entités tenu à la fréquence cible
+
+    Les frames sont regroupées par fenêtres d'une seconde. Une fenêtre est tenue
+    si sa durée moyenne de frame reste dans le budget ; elle compte alors pour le
+    minimum d'entités présentes pendant la fenêtre. Après `give_up` fenêtres
+    ratées d'affilée, le moteur est considéré saturé (failed).
+    """
+    def __init__(self, target_fps=TICK_RATE, window=TICK_RATE, tolerance=1.1, give_up=3):
+        self.budget_ms = 1000 / target_fps * tolerance
+        self.window = window
+        self.give_up = give_up
+        self.reset()
+
+    def reset(self):
+        self.best = {}  # type d'entité -> maximum tenu
+        self.failures = 0
+        self.windows = 0
+        self._frames = 0
+        self._total_ms = 0.0
+        self._low = None
+
+    @property
+    def failed(self):
+        return self.failures >= self.give_up
+
+    def add(self, frame_ms, counts):
+        """Ajoute une frame (durée en ms et {type d'entité: nombre})"""
+        if self._low is None:
+            self._low = dict(counts)
+        else:
+            for name, n in counts.items():
+                self._low[name] = min(self._low[name], n)
+        self._frames += 1
+        self._total_ms += frame_ms
+        if self._frames < self.window:
+            return
+        self.windows += 1
+        if self._total_ms / self._frames <= self.budget_ms:
+            self.failures = 0
+            for name, n in self._low.items():
+                self.best[name] = max(self.best.get(name, 0), n)
+        else:
+            self.failures += 1
+        self._frames, self._total_ms, self._low = 0, 0.0, None
+
+    def report(self):
+        return {
+            "budget_ms": self.budget_ms,
+            "windows": self.windows,
+            "saturated": self.failed,
+            "sustained": dict(self.best),
+        }
+
+
+def memory_kb():
+    """Mémoire résidente du processus (Ko), None si on ne sait pas la lire"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource  # Pas disponible sous Windows
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # Pic, pas la valeur courante
+    except ImportError:
+        return None
+
+
+class SoakMonitor:
+    """ Test d'endurance : temps de frame, score et mémoire relevés à intervalles réguliers """
+    def __init__(self, interval=60.0):
+        self.interval = interval  # Secondes (temps réel) entre deux relevés
+        self.samples = []
+        self.frame_ms = []
+        self.games = []  # Score et durée (pas) de chaque partie terminée
+        self.start = time.perf_counter()
+        self.next_sample = self.start
+
+    def frame(self, frame_ms, session):
+        self.frame_ms.append(frame_ms)
+        if time.perf_counter() >= self.next_sample:
+            self.sample(session)
+
+    def game_over(self, session):
+        self.games.append({"score": session.score, "ticks": session.ticks})
+
+    def sample(self, session):
+        now = time.perf_counter()
+        ordered = sorted(self.frame_ms)
+        n = len(ordered)
+        self.samples.append({
+            "elapsed_s": now - self.start,
+            "games": len(self.games),
+            "score": session.score,
+            "best_score": max([session.score] + [g["score"] for g in self.games]),
+            "frame_avg_ms": sum(ordered) / n if n else 0.0,
+            "frame_p99_ms": ordered[min(n - 1, int(n * 0.99))] if n else 0.0,
+            "frame_max_ms": ordered[-1] if n else 0.0,
+            "entities": session.entity_counts(),
+            "memory_kb": memory_kb(),
+            "gc_objects": len(gc.get_objects()),
+        })
+        self.frame_ms = []
+        self.next_sample = now + self.interval
+        return self.samples[-1]
+
+    def report(self):
+        """Résumé : nombre de parties, meilleur score et croissance mémoire depuis le premier relevé"""
+        if not self.samples:
+            return {}
+        first, last = self.samples[0], self.samples[-1]
+        growth = None
+        if first["memory_kb"] is not None and last["memory_kb"] is not None:
+            growth = last["memory_kb"] - first["memory_kb"]
+        return {
+            "elapsed_s": last["elapsed_s"],
+            "games": len(self.games),
+            "best_score": last["best_score"],
+            "frame_p99_ms": max(s["frame_p99_ms"] for s in self.samples),
+            "memory_growth_kb": growth,
+            "gc_objects_growth": last["gc_objects"] - first["gc_objects"],
+        }
+
+    def export(self, path=None):
+        if path is None:
+            path = time.strftime("soak_%Y%m%d_%H%M%S.json")
+        with open(path, "w") as f:
+            json.dump({"report": self.report(), "samples": self.samples, "games": self.games},
+                      f, indent=2)
+        return path
@@ -0,0 +1,188 @@
+""" Registre unique des assets (images, sons, atlas)
+
+Le manifeste associe un nom ("sprite:apple", "sound:ice"...) à un fichier et à
+ses options de décodage ("size", "width", "alpha", "smooth" pour les images ;
+les musiques ne sont pas décodées, acquire() en donne le chemin ;
+"optional" : pas d'avertissement si le fichier manque). Le registre :
+    - cherche le fichier dans les dossiers de son type (ex : image/ puis images/),
+      par rapport au dossier du jeu et non au dossier courant ;
+    - ne décode un fichier qu'à la première demande (acquire) ;
+    - partage un seul décodage entre les noms qui pointent sur le même fichier
+      avec les mêmes options ;
+    - compte les références : un asset relâché (release) par tous ses
+      utilisateurs reste en mémoire tant que le total des assets inutilisés
+      tient dans `budget` octets, puis les plus anciens sont libérés ;
+    - donne la mémoire décodée de chaque asset (report).
+
+acquire() peut être appelé depuis les threads de chargement (voir loader.py).
+"""
+import os
+import threading
+from collections import OrderedDict
+import pygame
+from atlas import AtlasBundle
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+UNUSED_BUDGET = 8 * 1024 * 1024  # Octets gardés pour les assets relâchés
+
+
+class Entry:
+    """ Un fichier décodé et ses utilisateurs """
+    def __init__(self, path, asset, size):
+        self.path = path
+        self.asset = asset
+        self.bytes = size
+        self.refs = 0
+
+
+def surface_bytes(surf):
+    """Mémoire des pixels d'une surface (0 pour une sous-surface : pixels partagés)"""
+    if surf.get_parent() is not None:
+        return 0
+    return surf.get_width() * surf.get_height() * surf.get_bytesize()
+
+
+def sound_bytes(sound):
+    """Mémoire d'un son décodé, d'après sa durée et le format du mixer"""
+    init = pygame.mixer.get_init()
+    if init is None:
+        return 0
+    freq, size, channels = init
+    return int(sound.get_length() * freq * channels * abs(size) // 8)
+
+
+class AssetRegistry:
+    def __init__(self, manifest, search_dirs, root=BASE_DIR, budget=UNUSED_BUDGET):
+        self.manifest = manifest  # nom -> {"type", "file", options...}
+        self.search_dirs = search_dirs  # type -> [dossiers]
+        self.root = root
+        self.budget = budget
+        self.paths = {}  # nom -> chemin résolu (None si introuvable)
+        self.entries = {}  # clé de décodage -> Entry
+        self.unused = OrderedDict()  # Entrées sans utilisateur, la plus ancienne en premier
+        self.lock = threading.Lock()
+        self.decodes = 0
+        self.evicted = 0
+
+    def resolve(self, name):
+        """Chemin du fichier de `name`, cherché dans les dossiers de son type"""
+        if name not in self.paths:
+            spec = self.manifest[name]
+            path = None
+            for folder in self.search_dirs[spec["type"]]:
+                candidate = os.path.join(self.root, folder, spec["file"])
+                if os.path.exists(candidate):
+                    path = candidate
+                    break
+            if path is None and not spec.get("optional"):
+                print(f"Attention : {spec['file']} non trouvé ({name})")
+            self.paths[name] = path
+        return self.paths[name]
+
+    def _key(self, name):
+        """Même clé = même décodage : fichier résolu et options qui changent le résultat"""
+        spec = self.manifest[name]
+        options = tuple(sorted((k, v) for k, v in spec.items() if k not in ("file", "optional")))
+        return (self.resolve(name) or spec["file"], options)
+
+    def _decode(self, name):
+        """Retourne (asset, octets) ; (None, 0) si le fichier manque ou est illisible"""
+        path = self.resolve(name)
+        if path is None:
+            return None, 0
+        spec = self.manifest[name]
+        if spec["type"] == "music":
+            return path, 0  # Lue en streaming : seul le chemin est gardé
+        try:
+            if spec["type"] == "sound":
+                sound = pygame.mixer.Sound(path)
+                return sound, sound_bytes(sound)
+            if spec["type"] == "atlas":
+                atlas = AtlasBundle(path)
+                return atlas, surface_bytes(atlas.sheet)
+            img = pygame.image.load(path)
+            # Conversion dans le thread appelant (thread de chargement compris)
+            if pygame.display.get_surface() is not None:
+                img = img.convert_alpha() if spec.get("alpha", True) else img.convert()
+            size = spec.get("size")
+            if "width" in spec:
+                size = (spec["width"], int(img.get_height() * spec["width"] / img.get_width()))
+            if size:
+                scale = pygame.transform.smoothscale if spec.get("smooth") else pygame.transform.scale
+                img = scale(img, size)
+            return img, surface_bytes(img)
+        except (pygame.error, OSError, ValueError) as e:
+            print(f"Attention : {path} illisible ({e})")
+            return None, 0
+
+    def acquire(self, name):
+        """Asset de `name` (décodé à la première demande), None s'il manque"""
+        key = self._key(name)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                entry.refs += 1
+                self.unused.pop(key, None)
+                return entry.asset
+        # Décodage hors du verrou : les threads de chargement travaillent en parallèle
+        asset, size = self._decode(name)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:  # Sinon un autre thread l'a décodé entre-temps
+                entry = self.entries[key] = Entry(self.resolve(name), asset, size)
+                self.decodes += 1
+            entry.refs += 1
+            self.unused.pop(key, None)
+            return entry.asset
+
+    def release(self, name):
+        """Fin d'utilisation ; l'asset peut être libéré quand plus personne ne s'en sert"""
+        key = self._key(name)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry.refs == 0:
+                return
+            entry.refs -= 1
+            if entry.refs == 0:
+                self.unused[key] = entry
+                self._trim(self.budget)
+
+    def evict(self, budget=0):
+        """Libère les assets inutilisés au-delà de `budget` octets ; retourne les octets libérés"""
+        with self.lock:
+            return self._trim(budget)
+
+    def _trim(self, budget):
+        freed = 0
+        unused_bytes = sum(entry.bytes for entry in self.unused.values())
+        while self.unused and unused_bytes > budget:
+            key, entry = self.unused.popitem(last=False)
+            del self.entries[key]
+            unused_bytes -= entry.bytes
+            freed += entry.bytes
+            self.evicted += 1
+        return freed
+
+    def report(self):
+        """Mémoire décodée par asset (les noms qui partagent un fichier sont regroupés)"""
+        with self.lock:
+            by_key = {}
+            for name in self.manifest:
+                if name in self.paths:
+                    by_key.setdefault(self._key(name), []).append(name)
+            assets = {}
+            for key, entry in self.entries.items():
+                names = by_key.get(key, [])
+                assets[" + ".join(names) or entry.path] = {
+                    "path": entry.path and os.path.relpath(entry.path, self.root),
+                    "bytes": entry.bytes,
+                    "refs": entry.refs,
+                    "missing": entry.asset is None,
+                }
+            return {
+                "assets": assets,
+                "resident_bytes": sum(entry.bytes for entry in self.entries.values()),
+                "unused_bytes": sum(entry.bytes for entry in self.unused.values()),
+                "decodes": self.decodes,
+                "evicted": self.evicted,
+            }
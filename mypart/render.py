@@ -0,0 +1,48 @@
+import pygame
+from settings import *
+
+
+class RenderQueue:
+    """ File de rendu : les sprites d'une couche sont envoyés en un seul appel
+
+    Chaque entité ajoute ses paires (image, position) avec add() ; flush() les
+    dessine d'un coup avec Surface.fblits (ou Surface.blits si indisponible), dans
+    l'ordre d'ajout. Les entités hors de l'écran sont écartées par visible()
+    avant même d'être pivotées.
+    """
+    def __init__(self, viewport=(0, 0, WIDTH, HEIGHT)):
+        self.viewport = pygame.Rect(viewport)
+        self.items = []
+        self.culled = self.submitted = self.calls = 0
+
+    def visible(self, x, y, w, h):
+        """La zone (x, y, w, h) touche-t-elle l'écran ? Sinon l'entité est comptée comme écartée"""
+        view = self.viewport
+        if x >= view.right or y >= view.bottom or x + w <= view.left or y + h <= view.top:
+            self.culled += 1
+            return False
+        return True
+
+    def add(self, image, pos):
+        self.items.append((image, pos))
+
+    def flush(self, surf):
+        """Dessine la couche en attente en un seul appel"""
+        if not self.items:
+            return
+        fblits = getattr(surf, "fblits", None)
+        if fblits is not None:
+            fblits(self.items)
+        else:
+            surf.blits(self.items, doreturn=False)
+        self.submitted += len(self.items)
+        self.calls += 1
+        self.items = []
+
+    def stats(self):
+        return {
+            "submitted": self.submitted,
+            "culled": self.culled,
+            "calls": self.calls,
+            "sprites_per_call": self.submitted / self.calls if self.calls else 0.0,
+        }
@@ -0,0 +1,86 @@
+""" Enregistrement et relecture des parties (replays)
+
+Un replay contient la graine et le mode de la partie, puis les entrées qui
+comptent (touches, pause, reprise) horodatées au pas de simulation près. Avec
+la même graine, GameSession rejoue exactement la même partie.
+
+Format binaire (little-endian) :
+    en-tête : "FSRP", version (u8), graine (u32), mode (u8)
+    événements : pas de simulation (u32), temps réel en ms (u32), type (u8), code (u8)
+    fin : nombre de pas (u32) et score final (u32)
+
+Relecture : python headless.py --replay replays/fichier.fsr [--render]
+"""
+import os
+import struct
+import time
+
+MAGIC = b"FSRP"
+VERSION = 1
+HEADER = struct.Struct("<4sBIB")
+EVENT = struct.Struct("<IIBB")
+FOOTER = struct.Struct("<II")
+
+KEY, PAUSE, RESUME = range(3)
+KEYS = ["a", "w", "s", "d", "j", "k", "l", "space"]  # Seules touches qui agissent sur la partie
+MODES = ["CLASSIC", "CHALLENGE", "STORM"]
+
+
+class ReplayRecorder:
+    """ Enregistre les entrées d'une partie pendant qu'elle se joue """
+    def __init__(self, seed, mode):
+        self.seed, self.mode = seed, mode
+        self.events = bytearray()
+        self.start = time.perf_counter()
+
+    def _add(self, tick, kind, code=0):
+        ms = int((time.perf_counter() - self.start) * 1000)
+        self.events += EVENT.pack(tick, ms, kind, code)
+
+    def key(self, tick, key_name):
+        if key_name in KEYS:
+            self._add(tick, KEY, KEYS.index(key_name))
+
+    def pause(self, tick):
+        self._add(tick, PAUSE)
+
+    def resume(self, tick):
+        self._add(tick, RESUME)
+
+    def save(self, path, ticks, score):
+        """Écrit le replay (le score final sert de contrôle à la relecture)"""
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, self.seed, MODES.index(self.mode)))
+            f.write(self.events)
+            f.write(FOOTER.pack(ticks, score))
+        return path
+
+
+class Replay:
+    """ Replay chargé depuis un fichier """
+    def __init__(self, seed, mode, events, ticks, score):
+        self.seed, self.mode = seed, mode
+        self.events = events  # Liste de (pas, ms, type, code)
+        self.ticks, self.score = ticks, score
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, seed, mode = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} : replay invalide ou version non supportée")
+        body = data[HEADER.size:len(data) - FOOTER.size]
+        ticks, score = FOOTER.unpack_from(data, len(data) - FOOTER.size)
+        return cls(seed, MODES[mode], list(EVENT.iter_unpack(body)), ticks, score)
+
+    def script(self):
+        """Touches à appuyer avant chaque pas : {pas: [touches]} (format de headless.py)"""
+        script = {}
+        for tick, ms, kind, code in self.events:
+            if kind == KEY:
+                script.setdefault(tick, []).append(KEYS[code])
+        return script
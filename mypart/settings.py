@@ -15,3 +15,18 @@ combo_count = 0
 COMBO_THRESHOLD = 30  # Seuil pour maintenir le combo (frames)
 
 WIDTH, HEIGHT = 800, 600
+
+# Boucle à pas fixe : la simulation tourne toujours à TICK_RATE pas par seconde,
+# quel que soit le nombre d'images affichées
+TICK_RATE = 60
+MAX_FRAME_MS = 250  # Retard maximum rattrapé en une image (évite la spirale de la mort)
+
+# Cache des sprites pivotés (voir assets.RotationCache)
+ROTATION_STEP = 5  # Pas de quantification de l'angle (degrés)
+ROTATION_CACHE_BYTES = None  # Octets max de sprites pivotés gardés (None : déduit des sprites, voir RotationCache.fit)
+TEXT_CACHE_MAX = 256  # Nombre maximum de textes rendus gardés en mémoire (LRU)
+
+# Particules (voir particles.ParticleSystem)
+PARTICLE_MAX = 100000  # Nombre maximum de particules vivantes
+PARTICLES_PER_CUT = 4  # Particules par fruit coupé
+PARTICLES_PER_AREA_CUT = 24  # Particules par objet lors d'une coupe de zone